@@ -4,11 +4,11 @@ SpectralPhysics-Lab: базовые численные инструменты
 """
 
 from .root_finding import symmetric_newton
-from .spectrum import Spectrum1D
+from .spectrum import Spectrum1D, SpectrumBatch
 from .medium_1d import OscillatorChain1D
 from .grav_toy import spectral_pressure_difference
 from .material import MaterialSignature
-from .timeseries import timeseries_to_spectrum
+from .timeseries import timeseries_to_spectrum, timeseries_batch_to_spectrum
 from .diagnostics import (
     ChannelConfig, 
     MultiChannelConfig,
@@ -31,10 +31,12 @@ from .report import generate_markdown_report
 __all__ = [
     "symmetric_newton",
     "Spectrum1D",
+    "SpectrumBatch",
     "OscillatorChain1D",
     "spectral_pressure_difference",
     "MaterialSignature",
     "timeseries_to_spectrum",
+    "timeseries_batch_to_spectrum",
     "ChannelConfig",
     "MultiChannelConfig",
     "SpectralAnalyzer",
@@ -147,7 +147,7 @@ def score_command(args):
 
     # Calculate scores
     scores = profile.score(current_spectra)
-    anomalies = profile.is_anomalous(current_spectra, thresholds)
+    anomalies = profile.is_anomalous(current_spectra, thresholds, scores=scores)
     
     # Generate report
     print("\n" + "=" * 60)
@@ -1,8 +1,13 @@
 import numpy as np
+import scipy.special
 from dataclasses import dataclass
-from .timeseries import timeseries_to_spectrum
-from .spectrum import Spectrum1D
-from .material import MaterialSignature
+from .timeseries import _power_spectra
+from .spectrum import Spectrum1D, SpectrumBatch
+from .material import MaterialSignature, _normalized_l2sq
+
+
+# Сколько наборов границ полосы (по длине кадра) хранит SpectralAnalyzer
+_BAND_CACHE_SIZE = 32
 
 
 @dataclass
@@ -36,6 +41,10 @@ class MultiChannelConfig:
 class SpectralAnalyzer:
     """
     Инструмент: временной ряд -> спектр -> обрезка по диапазону частот.
+
+    Анализатор держит рабочий буфер под кадр и переиспользует его между
+    вызовами analyze(), поэтому один экземпляр не следует вызывать
+    одновременно из нескольких потоков.
     """
 
     def __init__(self, config: ChannelConfig):
@@ -44,6 +53,11 @@ class SpectralAnalyzer:
             config: Конфигурация канала.
         """
         self.config = config
+        # (длина кадра, dt, freq_min, freq_max) -> границы [lo, hi) полосы;
+        # не больше _BAND_CACHE_SIZE записей, старейшая вытесняется первой
+        self._band_cache: dict[tuple, tuple[int, int]] = {}
+        # Рабочий буфер (1, n) под центрированный кадр последней длины
+        self._work: np.ndarray | None = None
 
     def analyze(self, signal: np.ndarray) -> Spectrum1D:
         """
@@ -58,34 +72,44 @@ class SpectralAnalyzer:
         Returns:
             Spectrum1D только по выбранному диапазону частот.
         """
-        # Преобразование в спектр
-        spectrum = timeseries_to_spectrum(
-            signal,
-            dt=self.config.dt,
-            window=self.config.window
+        signal = np.asarray(signal, dtype=np.float64)
+        if signal.ndim != 1:
+            raise ValueError(f"Signal must be 1D array, got shape {signal.shape}")
+
+        # Преобразование в спектр; кадры одной длины центрируются
+        # в одном и том же рабочем буфере вместо нового массива
+        work = self._work
+        if work is None or work.shape[1] != signal.size:
+            work = self._work = np.empty((1, signal.size))
+        omega, power = _power_spectra(
+            signal[None, :], self.config.dt, self.config.window, work=work
         )
-        
+        spectrum = Spectrum1D(omega=omega, power=power[0])
+
         # Если не заданы ограничения частот, вернуть весь спектр
         if self.config.freq_min is None and self.config.freq_max is None:
             return spectrum
-        
-        # Преобразовать omega в Герцы
-        freq_hz = spectrum.omega / (2 * np.pi)
-        
-        # Определить маску для диапазона частот
-        mask = np.ones(len(freq_hz), dtype=bool)
-        
-        if self.config.freq_min is not None:
-            mask &= (freq_hz >= self.config.freq_min)
-        
-        if self.config.freq_max is not None:
-            mask &= (freq_hz <= self.config.freq_max)
-        
-        # Вырезать диапазон
-        omega_filtered = spectrum.omega[mask]
-        power_filtered = spectrum.power[mask]
-        
-        return Spectrum1D(omega=omega_filtered, power=power_filtered)
+
+        # Границы полосы зависят только от длины сигнала и настроек канала:
+        # при потоковой обработке кадров одной длины считаются один раз
+        config = self.config
+        # Ключ - длина кадра, а не len(omega): кадры длины 2k и 2k + 1 дают
+        # одинаковое число бинов rfft, но разные сетки частот
+        key = (signal.size, config.dt, config.freq_min, config.freq_max)
+        bounds = self._band_cache.get(key)
+        if bounds is None:
+            bounds = _band_slice(
+                spectrum.omega,
+                -np.inf if config.freq_min is None else config.freq_min,
+                np.inf if config.freq_max is None else config.freq_max,
+            )
+            if len(self._band_cache) >= _BAND_CACHE_SIZE:
+                del self._band_cache[next(iter(self._band_cache))]
+            self._band_cache[key] = bounds
+        lo, hi = bounds
+
+        # Вырезать диапазон (срезы - представления, без копирования)
+        return Spectrum1D(omega=spectrum.omega[lo:hi], power=spectrum.power[lo:hi])
 
 
 class HealthMonitor:
@@ -101,30 +125,76 @@ class HealthMonitor:
         """
         self.signature = MaterialSignature(reference=reference)
         self.threshold = float(threshold)
+        # Рабочий буфер для score(): без аллокаций на каждый вызов
+        # (поэтому один монитор не следует вызывать из разных потоков).
+        # Выделяется лениво под сетку текущего эталона, см. _buffer().
+        self._scratch: np.ndarray | None = None
 
-    def score(self, current: Spectrum1D) -> float:
+    def _buffer(self) -> np.ndarray:
+        """
+        Рабочий буфер формы и dtype мощности эталона. Перевыделяется,
+        если эталон signature.reference заменили спектром на другой сетке.
+        """
+        ref_power = self.signature.reference.power
+        buf = self._scratch
+        if buf is None or buf.shape != ref_power.shape or buf.dtype != ref_power.dtype:
+            buf = self._scratch = np.empty_like(ref_power)
+        return buf
+
+    def score(self, current: Spectrum1D | SpectrumBatch) -> float | np.ndarray:
         """
         Вернуть L2-дистанцию между текущим спектром и эталонным.
-        
+
+        Использует внутренний буфер монитора: не потокобезопасно.
+
         Args:
-            current: Текущий спектр.
-        
+            current: Текущий спектр или SpectrumBatch.
+
         Returns:
-            L2-расстояние (скаляр).
+            L2-расстояние (скаляр), для SpectrumBatch - массив (M,).
         """
-        return self.signature.distance_l2(current)
+        if isinstance(current, SpectrumBatch):
+            return self.signature.distance_l2_batch(current)
 
-    def is_anomalous(self, current: Spectrum1D) -> bool:
+        # То же, что signature.distance_l2, но нормировка и разность
+        # пишутся в заранее выделенный буфер
+        signature = self.signature
+        signature._check_grid(current)
+
+        buf = current.normalize_into(self._buffer())
+        np.subtract(buf, signature._normalized_reference(), out=buf)
+        return float(np.sqrt(np.dot(buf, buf)))
+
+    def is_anomalous(self, current: Spectrum1D | SpectrumBatch) -> bool | np.ndarray:
         """
         True, если текущий спектр аномален (distance > threshold).
-        
+
         Args:
-            current: Текущий спектр.
-        
+            current: Текущий спектр или SpectrumBatch.
+
         Returns:
-            True если аномален, False иначе.
+            True если аномален, False иначе; для SpectrumBatch -
+            булев массив (M,).
         """
-        return self.signature.is_anomalous(current, self.threshold)
+        if isinstance(current, SpectrumBatch):
+            return self.signature.distance_l2_batch(current) > self.threshold
+
+        signature = self.signature
+        signature._check_grid(current)
+        # Проверки входа - до досрочного выхода по отрицательному порогу
+        total = current.total_power()
+        if total == 0:
+            raise ValueError("Cannot normalize spectrum with zero total power")
+        ref = signature._normalized_reference()
+        if self.threshold < 0:
+            return True
+
+        # Нормировка, разность и сумма квадратов блоками в буфере монитора;
+        # выход, как только сумма превысила threshold^2 (без sqrt)
+        thr2 = self.threshold ** 2
+        return _normalized_l2sq(
+            ref, current.power, total, thr2, buf=self._buffer(),
+        ) > thr2
 
 
 def average_spectrum(spectra: list[Spectrum1D]) -> Spectrum1D:
@@ -147,18 +217,21 @@ def average_spectrum(spectra: list[Spectrum1D]) -> Spectrum1D:
     omega_ref = spectra[0].omega
     n_points = len(omega_ref)
     
-    sum_power = np.zeros_like(spectra[0].power)
-    
+    # Проверка сеток, затем одна редукция mean(axis=0) по матрице
+    # (n_spectra, n_points) вместо накопления суммы в цикле Python
+    stacked = np.empty((len(spectra), n_points), dtype=spectra[0].power.dtype)
     for i, spec in enumerate(spectra):
-        if len(spec.omega) != n_points or not np.allclose(spec.omega, omega_ref):
+        if spec.omega is not omega_ref and (
+            len(spec.omega) != n_points or not np.allclose(spec.omega, omega_ref)
+        ):
             raise ValueError(
                 f"Spectrum at index {i} has different frequency grid"
             )
-        sum_power += spec.power
-        
-    avg_power = sum_power / len(spectra)
+        stacked[i] = spec.power
+
+    avg_power = stacked.mean(axis=0)
     
-    return Spectrum1D(omega=omega_ref.copy(), power=avg_power)
+    return Spectrum1D(omega=omega_ref, power=avg_power)
 
 
 def build_health_profile(
@@ -183,16 +256,44 @@ def build_health_profile(
             
         # 1. Усредняем спектры
         avg_spec = average_spectrum(spectra_list)
-        
+
         # 2. Создаем сигнатуру
         signature = MaterialSignature(reference=avg_spec)
-        
+
         # 3. Сохраняем
         signatures[channel_name] = signature
-        
+
     return HealthProfile(signatures=signatures)
 
 
+def _band_slice(
+    omega: np.ndarray,
+    freq_min: float,
+    freq_max: float,
+) -> tuple[int, int]:
+    """
+    Границы [lo, hi) полосы freq_min <= omega / 2pi <= freq_max
+    для отсортированной сетки omega (бинарный поиск вместо маски).
+    
+    Поиск идёт по omega с границами 2pi * f; затем край сдвигается
+    на несколько элементов, чтобы совпасть с маской по omega / 2pi
+    с точностью до последнего бита округления.
+    """
+    two_pi = 2 * np.pi
+    n = omega.size
+    lo = int(np.searchsorted(omega, two_pi * freq_min, side="left"))
+    while lo > 0 and omega[lo - 1] / two_pi >= freq_min:
+        lo -= 1
+    while lo < n and omega[lo] / two_pi < freq_min:
+        lo += 1
+    hi = int(np.searchsorted(omega, two_pi * freq_max, side="right"))
+    while hi < n and omega[hi] / two_pi <= freq_max:
+        hi += 1
+    while hi > 0 and omega[hi - 1] / two_pi > freq_max:
+        hi -= 1
+    return lo, max(lo, hi)
+
+
 def spectral_band_power(
     spectrum: Spectrum1D,
     freq_min: float,
@@ -209,9 +310,15 @@ def spectral_band_power(
     Returns:
         Суммарная мощность в полосе.
     """
-    freq_hz = spectrum.omega / (2 * np.pi)
-    mask = (freq_hz >= freq_min) & (freq_hz <= freq_max)
-    return float(np.sum(spectrum.power[mask]))
+    omega = spectrum.omega
+    if omega.size > 1 and not np.all(omega[1:] >= omega[:-1]):
+        # Несортированная сетка: общий путь по маске
+        freq_hz = omega / (2 * np.pi)
+        mask = (freq_hz >= freq_min) & (freq_hz <= freq_max)
+        return float(np.sum(spectrum.power[mask], dtype=np.float64))
+    
+    lo, hi = _band_slice(omega, freq_min, freq_max)
+    return float(np.sum(spectrum.power[lo:hi], dtype=np.float64))
 
 
 def spectral_entropy(spectrum: Spectrum1D) -> float:
@@ -232,10 +339,11 @@ def spectral_entropy(spectrum: Spectrum1D) -> float:
     # Нормируем мощность (как вероятность)
     p = spectrum.power / total
     
-    # Исключаем нули для логарифма
-    p = p[p > 0]
+    # Неположительные p не вносят вклада: xlogy(0, 0) = 0 без
+    # выборки по маске и без отдельного массива log(p)
+    np.maximum(p, 0, out=p)
     
-    return float(-np.sum(p * np.log(p)))
+    return float(-np.sum(scipy.special.xlogy(p, p, out=p), dtype=np.float64))
 
 
 def extract_features(
@@ -249,16 +357,69 @@ def extract_features(
     Args:
         spectrum: Спектр.
         bands_hz: Список кортежей (min_hz, max_hz).
-        
+
     Returns:
         NumPy массив фич.
     """
-    features = []
-    for fmin, fmax in bands_hz:
-        features.append(spectral_band_power(spectrum, fmin, fmax))
+    omega = spectrum.omega
+    if omega.size > 1 and not np.all(omega[1:] >= omega[:-1]):
+        features = [
+            spectral_band_power(spectrum, fmin, fmax) for fmin, fmax in bands_hz
+        ]
+    else:
+        # Сортированная сетка проверяется один раз: каждая полоса -
+        # бинарный поиск границ и сумма по срезу, без проходов по маске
+        power = spectrum.power
+        features = []
+        for fmin, fmax in bands_hz:
+            lo, hi = _band_slice(omega, fmin, fmax)
+            features.append(float(np.sum(power[lo:hi], dtype=np.float64)))
     
     features.append(spectral_entropy(spectrum))
     return np.asarray(features, dtype=float)
 
 
+def extract_features_batch(
+    spectra: list[Spectrum1D] | SpectrumBatch,
+    bands_hz: list[tuple[float, float]],
+) -> np.ndarray:
+    """
+    extract_features для многих спектров на общей сетке частот.
+    
+    Мощности в полосах для всех спектров - одно матричное умножение
+    P @ W, где W (N, B) - индикаторы полос по сетке; энтропии -
+    одна построчная редукция xlogy по нормированной матрице.
+    
+    Args:
+        spectra: Список спектров (или SpectrumBatch) на одной сетке.
+        bands_hz: Список кортежей (min_hz, max_hz).
+    
+    Returns:
+        Матрица фич формы (S, len(bands_hz) + 1), строка i совпадает
+        с extract_features(spectra[i], bands_hz).
+    
+    Raises:
+        ValueError: Если список пуст или сетки частот не совпадают.
+    """
+    if not isinstance(spectra, SpectrumBatch):
+        spectra = SpectrumBatch.from_spectra(spectra)
+    power = np.asarray(spectra.power, dtype=np.float64)
+    
+    # Индикаторы полос (та же граница, что у spectral_band_power)
+    freq_hz = spectra.omega / (2 * np.pi)
+    weights = np.zeros((freq_hz.size, len(bands_hz)))
+    for b, (fmin, fmax) in enumerate(bands_hz):
+        weights[:, b] = (freq_hz >= fmin) & (freq_hz <= fmax)
+    
+    features = np.empty((power.shape[0], len(bands_hz) + 1))
+    np.matmul(power, weights, out=features[:, :-1])
+    
+    # Энтропия по строкам; спектры с нулевой мощностью дают 0
+    totals = power.sum(axis=1, keepdims=True)
+    p = np.divide(power, totals, out=np.zeros_like(power), where=totals != 0)
+    np.maximum(p, 0, out=p)
+    features[:, -1] = -scipy.special.xlogy(p, p, out=p).sum(axis=1)
+    return features
+
+
 
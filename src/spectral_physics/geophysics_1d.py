@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import numpy as np
 from .medium_1d import OscillatorChain1D
 from .root_finding import symmetric_newton
@@ -14,58 +14,63 @@ class LayeredMedium1D:
     layers: list[Layer]
     dx: float  # шаг дискретизации по глубине
 
+    # Последняя построенная цепочка и отпечаток параметров, по которым
+    # она построена: (dx, ((thickness, density, stiffness), ...)).
+    _chain_key: tuple | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _chain: OscillatorChain1D | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     def to_oscillator_chain(self) -> OscillatorChain1D:
         """
         Построить цепочку осцилляторов, где каждый узел
         наследует параметры слоя, в который он попадает.
+
+        Повторный вызов с теми же слоями и dx возвращает ранее
+        построенную цепочку; изменение слоёв (в том числе полей Layer
+        на месте) или dx приводит к перестроению. Возвращённую цепочку
+        не следует изменять на месте.
         """
+        key = (
+            self.dx,
+            tuple((l.thickness, l.density, l.stiffness) for l in self.layers),
+        )
+        if self._chain is not None and self._chain_key == key:
+            return self._chain
+        
+        self._chain = self._build_chain()
+        self._chain_key = key
+        return self._chain
+
+    def _build_chain(self) -> OscillatorChain1D:
+        """Собрать цепочку осцилляторов по текущим слоям."""
         total_depth = sum(layer.thickness for layer in self.layers)
         n_nodes = int(np.ceil(total_depth / self.dx))
         
-        masses = np.zeros(n_nodes)
-        k_springs = np.zeros(n_nodes - 1)
+        # Параметры слоёв - массивы (SoA); нижние границы слоёв
+        # накапливаются в том же порядке, что и при обходе слоёв
+        bounds = np.cumsum([layer.thickness for layer in self.layers])
+        densities = np.array([layer.density for layer in self.layers], dtype=float)
+        stiffnesses = np.array([layer.stiffness for layer in self.layers], dtype=float)
+        last = len(self.layers) - 1
+        
+        # Слой узла: первый, чья нижняя граница глубже узла
+        # (глубже полной толщины - последний слой)
+        depth = np.arange(n_nodes) * self.dx
+        node_layer = np.minimum(np.searchsorted(bounds, depth, side="right"), last)
+        
+        # Масса узла ~ плотность * dx (объем 1D элемента)
+        masses = densities[node_layer] * self.dx
         
-        current_depth = 0.0
+        # Пружина i - в середине между узлами i и i+1
+        depth = (np.arange(n_nodes - 1) + 0.5) * self.dx
+        spring_layer = np.minimum(np.searchsorted(bounds, depth, side="right"), last)
+        
+        # Жесткость пружины ~ stiffness / dx
+        k_springs = stiffnesses[spring_layer] / self.dx
         
-        # Заполняем массы узлов
-        for i in range(n_nodes):
-            depth = i * self.dx
-            
-            # Найти слой
-            layer_idx = 0
-            d_acc = 0.0
-            for l_idx, layer in enumerate(self.layers):
-                d_acc += layer.thickness
-                if depth < d_acc:
-                    layer_idx = l_idx
-                    break
-                # Если глубина больше полной (последний узел), берем последний слой
-                layer_idx = len(self.layers) - 1
-            
-            layer = self.layers[layer_idx]
-            
-            # Масса узла ~ плотность * dx (объем 1D элемента)
-            masses[i] = layer.density * self.dx
-            
-        # Заполняем пружины
-        for i in range(n_nodes - 1):
-            depth = (i + 0.5) * self.dx
-            
-            # Найти слой для пружины
-            layer_idx = 0
-            d_acc = 0.0
-            for l_idx, layer in enumerate(self.layers):
-                d_acc += layer.thickness
-                if depth < d_acc:
-                    layer_idx = l_idx
-                    break
-                layer_idx = len(self.layers) - 1
-            
-            layer = self.layers[layer_idx]
-            
-            # Жесткость пружины ~ stiffness / dx
-            k_springs[i] = layer.stiffness / self.dx
-            
         return OscillatorChain1D(
             n=n_nodes,
             m=masses,     # Передаем массив масс
@@ -123,28 +128,31 @@ def simulate_pulse_response(
     if np.ndim(k) == 0:
         k = np.full(chain.n - 1, float(k))
     
+    # Буферы выделяются один раз: внутри цикла только операции на месте
+    forces = np.zeros(chain.n)
+    f_springs = np.empty(chain.n - 1)
+    
     for step in range(n_steps):
         surface_signal[step] = x[0]
         
         # Расчет сил
         # F = -K * x
-        # Внутренние силы
-        forces = np.zeros(chain.n)
-        
         # Пружины
         # force on i from i+1: k[i] * (x[i+1] - x[i])
         # force on i+1 from i: -k[i] * (x[i+1] - x[i])
+        np.subtract(x[1:], x[:-1], out=f_springs)  # x[i+1] - x[i]
+        f_springs *= k
         
-        dx_springs = x[1:] - x[:-1] # x[i+1] - x[i]
-        f_springs = k * dx_springs
-        
+        forces.fill(0.0)
         forces[:-1] += f_springs
         forces[1:] -= f_springs
         
-        # Обновление
-        a = forces * m_inv
-        v += a * dt
-        x += v * dt
+        # Обновление: v += a*dt, x += v*dt
+        forces *= m_inv
+        forces *= dt
+        v += forces
+        np.multiply(v, dt, out=forces)
+        x += forces
         
     return t, surface_signal
 
@@ -169,17 +177,30 @@ def invert_single_layer_thickness(
     dt = t[1] - t[0]
     n_steps = len(target_signal)
     
+    # Сигнал зависит от h только через дискретизацию: толщины, дающие
+    # одинаковые массы и жесткости узлов, дают одинаковый сигнал.
+    # Стоимость запоминается по (m, k) цепочки, симуляция - один раз.
+    cost_cache: dict[tuple[bytes, bytes], float] = {}
+    
     def objective(h: float) -> float:
         # Собираем среду
         layer1 = Layer(thickness=h, density=density, stiffness=stiffness)
         medium = LayeredMedium1D(layers=[layer1] + fixed_layers_below, dx=dx)
         
+        chain = medium.to_oscillator_chain()
+        key = (chain.m.tobytes(), np.asarray(chain.k).tobytes())
+        cost = cost_cache.get(key)
+        if cost is not None:
+            return cost
+        
         # Симулируем
         _, signal = simulate_pulse_response(medium, dt=dt, n_steps=n_steps)
         
         # Сравниваем (L2 norm)
         diff = signal - target_signal
-        return float(np.sum(diff**2))
+        cost = float(np.sum(diff**2))
+        cost_cache[key] = cost
+        return cost
 
     from scipy.optimize import minimize_scalar
     
@@ -189,12 +210,6 @@ def invert_single_layer_thickness(
         method='bounded'
     )
     
-    res = minimize_scalar(
-        objective, 
-        bounds=(0.5 * thickness_guess, 2.0 * thickness_guess), 
-        method='bounded'
-    )
-    
     return float(res.x)
 
 def build_geo1d_health_profile(signal: np.ndarray) -> "FeatureSignature":
@@ -51,7 +51,8 @@ def spectral_pressure_difference(
     
     # Compute pressure difference
     # ΔP = Σ P(ω) * [α_right(ω) - α_left(ω)]
+    # Fused multiply-and-sum via dot: no temporary for the product
     delta_alpha = alpha_right - alpha_left
-    delta_p = np.sum(spectrum_bg.power * delta_alpha)
+    delta_p = np.dot(spectrum_bg.power, delta_alpha)
     
     return float(delta_p)
@@ -1,4 +1,5 @@
 import numpy as np
+from operator import methodcaller
 from pathlib import Path
 from .spectrum import Spectrum1D
 
@@ -20,7 +21,13 @@ def load_timeseries_csv(
         1D np.ndarray с данными сигнала.
     
     Raises:
-        ValueError: Если файл пустой, колонка отсутствует или файл не найден.
+        ValueError: Если файл пустой, строки разной ширины, колонка
+            отсутствует, в ней есть нечисловые значения или файл не найден.
+    
+    Notes:
+        Во float разбирается только выбранная колонка: нечисловые или
+        пустые значения в остальных колонках не проверяются. Число полей
+        проверяется в каждой строке.
     """
     path_obj = Path(path)
     
@@ -31,28 +38,44 @@ def load_timeseries_csv(
     skiprows = 1 if skip_header else 0
     
     try:
-        # Загружаем данные
-        data = np.loadtxt(path, delimiter=',', skiprows=skiprows, ndmin=2)
+        with open(path_obj, "r") as f:
+            text = f.read()
     except Exception as e:
         raise ValueError(f"Failed to load CSV file {path}: {e}")
     
+    # Строки данных без комментариев '#' и пустых строк (как в np.loadtxt).
+    # Число полей считается по запятым и должно совпадать во всех строках;
+    # map/filter со строковыми методами проходят по строкам без цикла Python
+    lines = text.splitlines()[skiprows:]
+    if "#" in text:
+        lines = [line.split("#", 1)[0] for line in lines]
+    rows = list(filter(str.strip, lines))
+    widths = list(map(methodcaller("count", ","), rows))
+    n_cols = widths[0] + 1 if widths else 0
+    if len(set(widths)) > 1:
+        i = next(i for i, w in enumerate(widths) if w != widths[0])
+        raise ValueError(
+            f"Failed to load CSV file {path}: data row {i + 1} has "
+            f"{widths[i] + 1} columns, expected {n_cols}"
+        )
+    
     # Проверка на пустой файл
-    if data.size == 0:
+    if n_cols == 0:
         raise ValueError(f"File {path} is empty")
     
-    # Если данные одномерные, сделать двумерными
-    if data.ndim == 1:
-        data = data.reshape(-1, 1)
-    
     # Проверка корректности индекса колонки
-    if column >= data.shape[1] or column < 0:
+    if column >= n_cols or column < 0:
         raise ValueError(
             f"Column index {column} is out of range. "
-            f"File has {data.shape[1]} columns (indices 0..{data.shape[1]-1})"
+            f"File has {n_cols} columns (indices 0..{n_cols-1})"
         )
     
-    # Извлечь нужную колонку
-    signal = data[:, column]
+    try:
+        # Разбираем только нужную колонку: остальные не конвертируются
+        # в float и не занимают память под полную матрицу
+        signal = np.loadtxt(rows, delimiter=',', usecols=column, ndmin=1)
+    except Exception as e:
+        raise ValueError(f"Failed to load CSV file {path}: {e}")
     
     return signal
 
@@ -88,19 +111,23 @@ def load_spectrum_npz(path: str) -> Spectrum1D:
         raise ValueError(f"File not found: {path}")
     
     try:
-        data = np.load(path)
+        data = np.load(path, allow_pickle=False)
     except Exception as e:
         raise ValueError(f"Failed to load .npz file {path}: {e}")
     
-    # Проверка наличия необходимых ключей
-    if 'omega' not in data or 'power' not in data:
-        raise ValueError(
-            f"File {path} missing required keys. "
-            f"Expected 'omega' and 'power', found: {list(data.keys())}"
-        )
-    
-    omega = data['omega']
-    power = data['power']
+    # Архив закрывается сразу после чтения двух массивов: каждый член
+    # читается один раз прямо в итоговый буфер (mmap_mode для .npz
+    # не действует - члены архива numpy всегда читает в память)
+    with data:
+        # Проверка наличия необходимых ключей
+        if 'omega' not in data or 'power' not in data:
+            raise ValueError(
+                f"File {path} missing required keys. "
+                f"Expected 'omega' and 'power', found: {list(data.keys())}"
+            )
+        
+        omega = data['omega']
+        power = data['power']
     
     return Spectrum1D(omega=omega, power=power)
 
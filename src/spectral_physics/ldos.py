@@ -23,17 +23,26 @@ def ldos_from_modes(
     """
     w_min, w_max = freq_window
     
-    # Маска частот, попадающих в окно
-    mask = (omegas >= w_min) & (omegas <= w_max)
-    
-    if not np.any(mask):
-        return np.zeros(modes.shape[0])
+    if omegas.size > 1 and np.all(omegas[1:] >= omegas[:-1]):
+        # Частоты по возрастанию (как из eigh): окно - непрерывный
+        # диапазон мод, срез без копирования матрицы мод
+        lo = int(np.searchsorted(omegas, w_min, side="left"))
+        hi = int(np.searchsorted(omegas, w_max, side="right"))
+        if hi <= lo:
+            return np.zeros(modes.shape[0], dtype=modes.dtype)
+        selected_modes = modes[:, lo:hi]
+    else:
+        # Маска частот, попадающих в окно
+        mask = (omegas >= w_min) & (omegas <= w_max)
+        
+        if not np.any(mask):
+            return np.zeros(modes.shape[0], dtype=modes.dtype)
         
-    # Выбираем нужные моды: (N_points, K_selected)
-    selected_modes = modes[:, mask]
+        # Выбираем нужные моды: (N_points, K_selected)
+        selected_modes = modes[:, mask]
     
     # Суммируем квадраты амплитуд по модам (вдоль оси 1)
-    # LDOS(x) = sum_i |psi_i(x)|^2
-    ldos = np.sum(selected_modes**2, axis=1)
+    # LDOS(x) = sum_i |psi_i(x)|^2 - одна свёртка без массива квадратов
+    ldos = np.einsum("pm,pm->p", selected_modes, selected_modes)
     
     return ldos
@@ -1,6 +1,76 @@
+import math
 import numpy as np
-from dataclasses import dataclass
-from .spectrum import Spectrum1D
+from dataclasses import dataclass, field
+from .spectrum import Spectrum1D, SpectrumBatch
+
+
+# Размер блока (в элементах) для поблочных проходов в _normalized_l2sq
+_L2_CHUNK = 4096
+
+
+def _normalized_l2sq(
+    ref: np.ndarray,
+    power: np.ndarray,
+    total: float,
+    thr2: float = np.inf,
+    buf: np.ndarray | None = None,
+) -> float:
+    """
+    sum((ref - power / total)^2) за один поблочный проход.
+
+    Нормировка, разность и квадрат считаются в буфере длиной не более
+    _L2_CHUNK, который остаётся в кэше процессора: нормированная копия
+    power целиком не создаётся. Как только частичная сумма превысила
+    thr2, возвращается она (досрочный выход для проверок по порогу).
+    buf - необязательный рабочий буфер (длиной не меньше блока).
+    """
+    n = power.shape[0]
+    if buf is None:
+        buf = np.empty(min(n, _L2_CHUNK), dtype=np.result_type(ref, power))
+    acc = 0.0
+    for start in range(0, n, _L2_CHUNK):
+        stop = min(start + _L2_CHUNK, n)
+        chunk = buf[:stop - start]
+        np.divide(power[start:stop], total, out=chunk)
+        np.subtract(chunk, ref[start:stop], out=chunk)
+        acc += float(np.dot(chunk, chunk))
+        if acc > thr2:
+            break
+    return acc
+
+
+def _dot_and_sq(a: np.ndarray, b: np.ndarray) -> tuple[float, float]:
+    """
+    (<a, b>, <b, b>) за один проход по памяти: каждый блок b длиной
+    _L2_CHUNK читается из памяти один раз и для второго скалярного
+    произведения берётся уже из кэша.
+    """
+    ab = 0.0
+    bb = 0.0
+    for start in range(0, b.shape[0], _L2_CHUNK):
+        b_chunk = b[start:start + _L2_CHUNK]
+        ab += float(np.dot(a[start:start + _L2_CHUNK], b_chunk))
+        bb += float(np.dot(b_chunk, b_chunk))
+    return ab, bb
+
+
+def _row_l2(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Построчная L2-норма разности двух матриц формы (C, N).
+    """
+    diff = a - b
+    return np.sqrt(np.einsum("ij,ij->i", diff, diff))
+
+
+def _same_refs(a: tuple, b: tuple) -> bool:
+    """
+    Совпадают ли ключи кэша HealthProfile: имена по значению,
+    подписи и нормированные эталоны - по идентичности объектов.
+    """
+    return len(a) == len(b) and all(
+        na == nb and sa is sb and ra is rb
+        for (na, sa, ra), (nb, sb, rb) in zip(a, b)
+    )
 
 
 @dataclass
@@ -16,7 +86,65 @@ class MaterialSignature:
     спектральных характеристик.
     """
     reference: Spectrum1D
+
+    # Копия reference.power (только для чтения), по которой посчитаны кэши
+    # ниже. Замена reference, его power или правка power на месте
+    # обнаруживаются сравнением с ней и приводят к пересчёту.
+    _ref_power: np.ndarray | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # Нормированный эталон (sum = 1) в dtype эталона; None при нулевой мощности
+    _ref_norm_power: np.ndarray | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # 1 / ||reference.power||_2 (0.0 для нулевого эталона)
+    _ref_inv_norm: float = field(default=0.0, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        """Один раз нормировать эталонный спектр."""
+        self._refresh_reference()
+
+    def _refresh_reference(self) -> None:
+        """Пересчитать кэши эталона, если мощность reference изменилась."""
+        power = self.reference.power
+        snap = self._ref_power
+        if (
+            snap is not None
+            and snap.dtype == power.dtype
+            and np.array_equal(snap, power)
+        ):
+            return
+
+        snap = power.copy()
+        snap.setflags(write=False)
+        total = float(np.sum(snap, dtype=np.float64))
+        self._ref_norm_power = snap / total if total != 0 else None
+        norm_sq = float(np.dot(snap, snap))
+        self._ref_inv_norm = 1.0 / np.sqrt(norm_sq) if norm_sq > 0 else 0.0
+        self._ref_power = snap
+
+    def _normalized_reference(self) -> np.ndarray:
+        """
+        Нормированная мощность эталона (из кэша).
+
+        Raises:
+            ValueError: Если у эталона нулевая суммарная мощность.
+        """
+        self._refresh_reference()
+        if self._ref_norm_power is None:
+            return self.reference.normalize().power
+        return self._ref_norm_power
     
+    def _check_grid(self, other: Spectrum1D) -> None:
+        """Проверить совпадение частотных сеток эталона и other."""
+        if not np.array_equal(self.reference.omega, other.omega):
+            raise ValueError(
+                "Frequency grids do not match. "
+                f"Reference has {len(self.reference.omega)} points, "
+                f"other has {len(other.omega)} points. "
+                "Cannot compute distance."
+            )
+
     def distance_l2(self, other: Spectrum1D) -> float:
         """
         L2-норма между нормированными спектрами.
@@ -34,24 +162,46 @@ class MaterialSignature:
             Спектры нормируются перед сравнением, чтобы различия
             в амплитуде не влияли на детекцию изменения формы спектра.
         """
-        # Проверка совпадения частотных сеток
-        if not np.array_equal(self.reference.omega, other.omega):
+        self._check_grid(other)
+        
+        # Эталон нормирован заранее; other нормируется на лету
+        # в одном проходе с разностью и суммой квадратов
+        total = other.total_power()
+        if total == 0:
+            raise ValueError("Cannot normalize spectrum with zero total power")
+        
+        # Вычисляем L2-расстояние
+        distance = np.sqrt(
+            _normalized_l2sq(self._normalized_reference(), other.power, total)
+        )
+        
+        return float(distance)
+    
+    def distance_l2_batch(self, batch: SpectrumBatch) -> np.ndarray:
+        """
+        distance_l2 для каждого спектра пакета за один векторный проход.
+        
+        Args:
+            batch: Пакет спектров на сетке эталона.
+        
+        Returns:
+            Массив L2-расстояний формы (M,).
+        
+        Raises:
+            ValueError: Если сетки по частоте не совпадают или у какого-то
+                спектра нулевая суммарная мощность.
+        """
+        if not np.array_equal(self.reference.omega, batch.omega):
             raise ValueError(
                 "Frequency grids do not match. "
                 f"Reference has {len(self.reference.omega)} points, "
-                f"other has {len(other.omega)} points. "
+                f"batch has {len(batch.omega)} points. "
                 "Cannot compute distance."
             )
         
-        # Нормируем оба спектра
-        ref_normalized = self.reference.normalize()
-        other_normalized = other.normalize()
-        
-        # Вычисляем L2-расстояние
-        diff = ref_normalized.power - other_normalized.power
-        distance = np.sqrt(np.sum(diff ** 2))
-        
-        return float(distance)
+        ref = self._normalized_reference()
+        current = batch.normalize().power
+        return _row_l2(current, np.broadcast_to(ref, current.shape))
     
     def distance_cosine(self, other: Spectrum1D) -> float:
         """
@@ -67,18 +217,20 @@ class MaterialSignature:
         if not np.array_equal(self.reference.omega, other.omega):
             raise ValueError("Frequency grids do not match")
         
-        # Работаем с векторами мощности
-        a = self.reference.power
+        # Работаем с векторами мощности; норма эталона посчитана заранее
+        # по тому же снимку эталона, что и a, <a, b> и ||b||^2
+        # накапливаются за один проход по b
+        self._refresh_reference()
+        a = self._ref_power
         b = other.power
         
-        norm_a = np.linalg.norm(a)
-        norm_b = np.linalg.norm(b)
+        dot_ab, norm_b_sq = _dot_and_sq(a, b)
         
-        if norm_a == 0 or norm_b == 0:
+        if self._ref_inv_norm == 0 or norm_b_sq == 0:
             # Если один из векторов нулевой, расстояние неопределено (или макс)
             return 1.0
             
-        cosine_similarity = np.dot(a, b) / (norm_a * norm_b)
+        cosine_similarity = dot_ab * self._ref_inv_norm / np.sqrt(norm_b_sq)
         
         # Ограничиваем [0, 1] для стабильности
         cosine_similarity = np.clip(cosine_similarity, 0.0, 1.0)
@@ -90,6 +242,9 @@ class MaterialSignature:
         """
         Вернуть True, если distance_l2(other) > threshold.
         
+        Сумма квадратов сравнивается с threshold^2 поблочно,
+        с досрочным выходом при превышении порога.
+        
         Args:
             other: Спектр для проверки.
             threshold: Порог аномальности.
@@ -105,22 +260,43 @@ class MaterialSignature:
             >>> if sig.is_anomalous(test_spectrum, threshold=0.1):
             ...     print("Обнаружена аномалия!")
         """
-        distance = self.distance_l2(other)
-        return distance > threshold
+        self._check_grid(other)
+        # Проверки входа - до любых досрочных выходов: те же ошибки,
+        # что и у distance_l2 (нулевая мощность other или эталона)
+        total = other.total_power()
+        if total == 0:
+            raise ValueError("Cannot normalize spectrum with zero total power")
+        ref = self._normalized_reference()
+        if threshold < 0:
+            return True
+        
+        # Сравниваем квадрат дистанции с threshold^2 (без sqrt)
+        # и прекращаем суммирование, как только порог превышен
+        thr2 = float(threshold) ** 2
+        return _normalized_l2sq(ref, other.power, total, thr2) > thr2
 
 
 @dataclass
 class FeatureSignature:
     """
     Спектральная сигнатура на пространстве фич.
+
+    reference_features хранится как C-contiguous float64 массив.
     """
     reference_features: np.ndarray
 
+    def __post_init__(self):
+        """Привести эталонный вектор к C-contiguous float64."""
+        self.reference_features = np.ascontiguousarray(
+            self.reference_features, dtype=np.float64
+        )
+
     def distance_l2(self, other_features: np.ndarray) -> float:
         if other_features.shape != self.reference_features.shape:
             raise ValueError("Feature vector shape mismatch")
+        # Короткие векторы: одна разность и dot, без массива квадратов
         diff = self.reference_features - other_features
-        return float(np.sqrt(np.sum(diff**2)))
+        return math.sqrt(float(np.dot(diff, diff)))
 
 
 @dataclass
@@ -131,16 +307,96 @@ class HealthProfile:
     signatures: dict[str, MaterialSignature]  # имя канала -> подпись
     feature_signatures: dict[str, FeatureSignature] | None = None
 
+    # Кэш нормированных эталонов, уложенных в матрицу (C, N):
+    # (ключ, матрица или None, если сетки разной длины,
+    # имя канала -> номер строки). Ключ - кортеж (имя, подпись,
+    # нормированный эталон) по каждому каналу; подписи и эталоны
+    # сравниваются по идентичности, так что замена подписи под тем же
+    # именем перестраивает матрицу.
+    _ref_cache: tuple[
+        tuple[tuple[str, "MaterialSignature", np.ndarray | None], ...],
+        np.ndarray | None,
+        dict[str, int],
+    ] | None = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def _ref_stack(self) -> np.ndarray | None:
+        """
+        Нормированные эталонные спектры всех каналов, матрица (C, N)
+        в порядке list(self.signatures.keys()).
+        None, если у каналов разные длины частотных сеток
+        или у какого-то эталона нулевая мощность.
+        """
+        for sig in self.signatures.values():
+            sig._refresh_reference()
+        key = tuple(
+            (name, sig, sig._ref_norm_power) for name, sig in self.signatures.items()
+        )
+        cached = self._ref_cache
+        if cached is None or not _same_refs(cached[0], key):
+            refs = [ref for _, _, ref in key]
+            if (
+                refs
+                and all(r is not None for r in refs)
+                and all(r.shape == refs[0].shape for r in refs)
+            ):
+                stack = np.stack(refs)
+            else:
+                stack = None
+            order = {name: i for i, (name, _, _) in enumerate(key)}
+            self._ref_cache = (key, stack, order)
+        return self._ref_cache[1]
+
+    def _distances(
+        self,
+        current: dict[str, Spectrum1D],
+        names: list[str],
+    ) -> np.ndarray:
+        """
+        L2-дистанции для каналов names одним векторизованным проходом.
+        """
+        stack = self._ref_stack
+        if stack is None or not names:
+            return np.array(
+                [self.signatures[name].distance_l2(current[name]) for name in names],
+                dtype=float,
+            )
+
+        order = self._ref_cache[2]
+        for name in names:
+            signature = self.signatures[name]
+            if not np.array_equal(signature.reference.omega, current[name].omega):
+                # Та же ошибка, что и у MaterialSignature.distance_l2
+                signature.distance_l2(current[name])
+
+        # Текущие спектры - в одну матрицу (C, N); нормировка и разность
+        # с эталонами на месте, без промежуточных копий
+        query = np.empty((len(names), stack.shape[1]), dtype=np.result_type(
+            stack.dtype, *(current[name].power.dtype for name in names)
+        ))
+        for i, name in enumerate(names):
+            query[i] = current[name].power
+        totals = query.sum(axis=1, keepdims=True)
+        if np.any(totals == 0):
+            raise ValueError("Cannot normalize spectrum with zero total power")
+        np.divide(query, totals, out=query)
+
+        if len(names) == stack.shape[0]:
+            # Все каналы в порядке signatures: эталон без выборки строк
+            refs = stack
+        else:
+            refs = stack[[order[name] for name in names]]
+        np.subtract(query, refs, out=query)
+        return np.sqrt(np.einsum("ij,ij->i", query, query))
+
     def score(self, current: dict[str, Spectrum1D]) -> dict[str, float]:
         """
         Вернуть словарь name -> distance_l2 для каждого канала.
         Канал присутствует в signatures и в current.
         """
-        scores = {}
-        for name, signature in self.signatures.items():
-            if name in current:
-                scores[name] = signature.distance_l2(current[name])
-        return scores
+        names = [name for name in self.signatures if name in current]
+        dists = self._distances(current, names)
+        return {name: float(d) for name, d in zip(names, dists)}
 
     def score_features(
         self,
@@ -157,28 +413,59 @@ class HealthProfile:
         if self.feature_signatures is None:
             return {}
             
-        scores = {}
-        for name, feat_sig in self.feature_signatures.items():
-            if name in current and name in bands_hz:
-                spec = current[name]
-                bands = bands_hz[name]
-                feats = extract_features(spec, bands)
-                scores[name] = feat_sig.distance_l2(feats)
-        return scores
+        names = [
+            name for name in self.feature_signatures
+            if name in current and name in bands_hz
+        ]
+        feats = [extract_features(current[name], bands_hz[name]) for name in names]
+
+        refs = []
+        for name, f in zip(names, feats):
+            ref = self.feature_signatures[name].reference_features
+            if f.shape != ref.shape:
+                raise ValueError("Feature vector shape mismatch")
+            refs.append(ref)
+
+        if names and all(r.shape == refs[0].shape for r in refs):
+            # Все каналы с одинаковым числом фич: одна построчная редукция
+            dists = _row_l2(np.stack(refs), np.stack(feats))
+        else:
+            dists = [
+                self.feature_signatures[name].distance_l2(f)
+                for name, f in zip(names, feats)
+            ]
+        return {name: float(d) for name, d in zip(names, dists)}
 
     def is_anomalous(
         self,
         current: dict[str, Spectrum1D],
         thresholds: dict[str, float],
+        scores: dict[str, float] | None = None,
     ) -> dict[str, bool]:
         """
         Вернуть словарь name -> bool (аномален / нет)
         по индивидуальным порогам для каждого канала.
+
+        scores: необязательный результат score() для тех же спектров;
+        дистанции каналов из него не пересчитываются. Вызывающий
+        отвечает за то, что спектры после score() не менялись.
         """
-        results = {}
-        for name, signature in self.signatures.items():
-            if name in current and name in thresholds:
-                results[name] = signature.is_anomalous(current[name], thresholds[name])
-        return results
+        names = [
+            name for name in self.signatures
+            if name in current and name in thresholds
+        ]
+
+        dists = np.empty(len(names))
+        missing = []
+        for i, name in enumerate(names):
+            if scores is not None and name in scores:
+                dists[i] = scores[name]
+            else:
+                missing.append(i)
 
+        if missing:
+            dists[missing] = self._distances(current, [names[i] for i in missing])
 
+        thr = np.array([thresholds[name] for name in names], dtype=float)
+        mask = dists > thr
+        return {name: bool(flag) for name, flag in zip(names, mask)}
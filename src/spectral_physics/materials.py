@@ -22,16 +22,18 @@ class MaterialPatch:
         # Для простоты объединим все частоты и просуммируем мощности
         # (предполагаем дискретные линии)
         
-        all_freqs = []
-        all_powers = []
+        # Линии всех атомов - одним concatenate, веса размножаются
+        # на линии своего атома через np.repeat (без цикла по линиям)
+        n = min(len(self.atoms), len(self.weights))
+        atoms = self.atoms[:n]
+        omegas = [np.asarray(atom.omega, dtype=float) for atom in atoms]
+        powers = [np.asarray(atom.power, dtype=float) for atom in atoms]
+        counts = [len(o) for o in omegas]
         
-        for atom, w in zip(self.atoms, self.weights):
-            spec = atom.spectrum()
-            all_freqs.extend(spec.omega)
-            all_powers.extend(spec.power * w)
-            
-        all_freqs = np.array(all_freqs)
-        all_powers = np.array(all_powers)
+        all_freqs = np.concatenate(omegas)
+        all_powers = np.concatenate(powers) * np.repeat(
+            np.asarray(self.weights, dtype=float)[:n], counts
+        )
         
         # Сортируем по частоте
         idx = np.argsort(all_freqs)
@@ -64,17 +66,20 @@ def effective_coupling(
     """
     spec = patch.surface_spectrum()
     
-    # Фильтруем спектр патча по окну
+    # Фильтруем спектр патча по окну: surface_spectrum() отдаёт omega
+    # по возрастанию, поэтому окно [w_min, w_max] - непрерывный срез
     w_min, w_max = freq_window
-    mask = (spec.omega >= w_min) & (spec.omega <= w_max)
+    lo = np.searchsorted(spec.omega, w_min, side="left")
+    hi = np.searchsorted(spec.omega, w_max, side="right")
     
-    if not np.any(mask):
+    if lo >= hi:
         return 0.0
         
-    patch_power = np.sum(spec.power[mask])
+    patch_power = float(spec.power[lo:hi].sum())
     
-    # Средний LDOS
-    avg_ldos = np.mean(ldos)
+    # Средний LDOS: накопление в float64 прямо по входному массиву,
+    # без приведения всей карты к contiguous float64
+    avg_ldos = np.mean(ldos, dtype=np.float64)
     
     return float(patch_power * avg_ldos)
 
@@ -89,7 +94,7 @@ def build_material_health_profile(ldos_map: np.ndarray) -> "FeatureSignature":
     """
     from .material import FeatureSignature
     
-    flat = ldos_map.flatten()
+    flat = np.ascontiguousarray(ldos_map, dtype=np.float64).ravel()
     features = np.array([
         np.mean(flat),
         np.std(flat),
@@ -150,6 +155,13 @@ class CandidateMaterial:
     confidence: float
     predicted_properties: dict
 
+# Toy candidate table for infer_material_from_ldos: (name, properties)
+_CANDIDATE_MATERIALS = [
+    ("Steel (Fe-C)", {"density": "high", "stiffness": "high"}),
+    ("Water (H2O)", {"density": "low", "stiffness": "low"}),
+    ("Concrete (Si-O)", {"density": "medium", "stiffness": "high"}),
+]
+
 def infer_material_from_ldos(
     ldos_map: np.ndarray,
     atom_db: dict[str, AtomicResonator]
@@ -160,60 +172,35 @@ def infer_material_from_ldos(
     This is a 'toy' inference engine.
     Real logic would involve matching spectral peaks to atomic/molecular signatures.
     """
-    # Extract features from LDOS
-    mean_val = np.mean(ldos_map)
-    std_val = np.std(ldos_map)
-    
-    candidates = []
+    # Extract features from LDOS (one pass for mean, one for deviations)
+    flat = np.ascontiguousarray(ldos_map, dtype=np.float64).ravel()
+    mean_val = flat.mean()
+    dev = flat - mean_val
+    std_val = np.sqrt(np.dot(dev, dev) / flat.size)
     
     # Toy logic:
     # High mean -> Light atoms (H, C) - higher activity?
     # Low mean -> Heavy atoms (Fe) - lower activity?
+    #
+    # Check against known "materials" (hardcoded for demo).
+    # Scores are plain arithmetic on comparison results (no if-chains):
+    # 1. "Steel" (Iron-based): low mean (heavy)
+    # 2. "Water" (H2O): high mean (light atoms), high variance
+    # 3. "Concrete" (Si-O based): medium mean
+    scores = np.array([
+        0.8 * (mean_val < 0.05) + 0.4 * ((mean_val >= 0.05) & (mean_val < 0.1)),
+        0.7 * (mean_val > 0.1) + 0.2 * (std_val > 0.02),
+        0.6 * ((mean_val >= 0.05) & (mean_val <= 0.15)),
+    ])
     
-    # Check against known "materials" (hardcoded for demo)
-    
-    # 1. "Steel" (Iron-based)
-    # Expect low mean (heavy), specific variance
-    score_steel = 0.0
-    if mean_val < 0.05:
-        score_steel += 0.8
-    elif mean_val < 0.1:
-        score_steel += 0.4
-        
-    candidates.append(CandidateMaterial(
-        name="Steel (Fe-C)",
-        confidence=score_steel,
-        predicted_properties={"density": "high", "stiffness": "high"}
-    ))
-    
-    # 2. "Water" (H2O)
-    # Expect high mean (light atoms), high variance
-    score_water = 0.0
-    if mean_val > 0.1:
-        score_water += 0.7
-    if std_val > 0.02:
-        score_water += 0.2
-        
-    candidates.append(CandidateMaterial(
-        name="Water (H2O)",
-        confidence=score_water,
-        predicted_properties={"density": "low", "stiffness": "low"}
-    ))
-    
-    # 3. "Concrete" (Si-O based)
-    # Medium mean
-    score_concrete = 0.0
-    if 0.05 <= mean_val <= 0.15:
-        score_concrete += 0.6
-        
-    candidates.append(CandidateMaterial(
-        name="Concrete (Si-O)",
-        confidence=score_concrete,
-        predicted_properties={"density": "medium", "stiffness": "high"}
-    ))
-    
-    # Sort by confidence
-    candidates.sort(key=lambda x: x.confidence, reverse=True)
+    # Sort by confidence (stable, as list.sort)
+    order = np.argsort(-scores, kind="stable")
     
-    return candidates
-
+    return [
+        CandidateMaterial(
+            name=_CANDIDATE_MATERIALS[i][0],
+            confidence=float(scores[i]),
+            predicted_properties=dict(_CANDIDATE_MATERIALS[i][1]),
+        )
+        for i in order
+    ]
@@ -1,5 +1,6 @@
 import numpy as np
 import scipy.linalg
+import scipy.sparse
 from dataclasses import dataclass
 
 
@@ -35,6 +36,31 @@ class OscillatorChain1D:
         if self.gamma < 0:
             raise ValueError("Damping must be non-negative")
     
+    def _spring_constants(self) -> np.ndarray:
+        """
+        Stiffness of all N+1 springs (wall-0, 0-1, ..., (N-1)-wall).
+        
+        An array k of length N-1 is padded with its edge values for the walls.
+        """
+        N = self.n
+        k_arr = np.asarray(self.k)
+        if k_arr.ndim == 0:
+            # Scalar
+            k_vals = np.full(N + 1, float(k_arr))
+        else:
+            # Array
+            if len(k_arr) == N - 1:
+                # Pad with edge values for walls
+                k_vals = np.zeros(N + 1)
+                k_vals[1:-1] = k_arr
+                k_vals[0] = k_arr[0]
+                k_vals[-1] = k_arr[-1]
+            elif len(k_arr) == N + 1:
+                k_vals = k_arr
+            else:
+                raise ValueError(f"Stiffness array length must be {N-1} or {N+1}")
+        return np.asarray(k_vals, dtype=float)
+
     def stiffness_matrix(self) -> np.ndarray:
         """
         Construct the stiffness matrix for the chain with nearest-neighbor coupling.
@@ -65,96 +91,59 @@ class OscillatorChain1D:
         Let's assume for now that if k is array (N-1), we use k[0] for left wall and k[-1] for right wall.
         """
         N = self.n
-        K = np.zeros((N, N))
-        
-        # Helper to get k for interval i (between node i and i+1)
-        # i goes from -1 (left wall) to N-1 (right wall)
-        
-        k_arr = np.asarray(self.k)
-        if k_arr.ndim == 0:
-            # Scalar
-            k_vals = np.full(N + 1, float(k_arr))
-        else:
-            # Array
-            if len(k_arr) == N - 1:
-                # Pad with edge values for walls
-                k_vals = np.zeros(N + 1)
-                k_vals[1:-1] = k_arr
-                k_vals[0] = k_arr[0]
-                k_vals[-1] = k_arr[-1]
-            elif len(k_arr) == N + 1:
-                k_vals = k_arr
-            else:
-                raise ValueError(f"Stiffness array length must be {N-1} or {N+1}")
-        
-        # k_vals[i] is spring between node i-1 and i?
-        # Let's say indices 0..N are springs.
-        # Spring 0: Wall -> Node 0
-        # Spring 1: Node 0 -> Node 1
-        # ...
-        # Spring N: Node N-1 -> Wall
-        
-        # Re-map k_vals to this logic
-        # If we had N-1 internal springs (0..N-2), they correspond to indices 1..N-1 in my new list.
+        k_vals = self._spring_constants()
+        
+        # Springs 0..N: spring i connects node i-1 and node i
+        # (spring 0 / spring N connect the end nodes to the walls).
+        # Node i gets k_vals[i] + k_vals[i+1] on the diagonal and
+        # -k_vals[i+1] coupling to node i+1.
+        main_diag = k_vals[:-1] + k_vals[1:]
+        off_diag = -k_vals[1:-1]
+        K = scipy.sparse.diags(
+            [main_diag, off_diag, off_diag], [0, -1, 1], shape=(N, N)
+        ).toarray()
         
-        # Let's build K
-        for i in range(N):
-            # Node i
-            
-            # Spring to left (index i)
-            k_left = k_vals[i]
-            K[i, i] += k_left
-            if i > 0:
-                K[i, i-1] = -k_left
-                
-            # Spring to right (index i+1)
-            k_right = k_vals[i+1]
-            K[i, i] += k_right
-            if i < N - 1:
-                K[i, i+1] = -k_right
-                
         return K
     
-    def eigenmodes(self) -> tuple[np.ndarray, np.ndarray]:
-        """
-        Compute eigenfrequencies and eigenmodes of the oscillator chain.
-        
-        Solves the eigenvalue problem: K * v = (m * omega^2) * v
-        where K is the stiffness matrix.
-        
-        Returns:
-            omega: Array of eigenfrequencies (sorted, >= 0).
-            modes: Matrix of eigenvectors (n, n), each column is a mode.
-        
-        Note:
-            Eigenfrequencies are angular frequencies (rad/s).
-            Modes are normalized eigenvectors.
-        """
-    def eigenmodes(self) -> tuple[np.ndarray, np.ndarray]:
+    def eigenmodes(self, n_modes: int | None = None) -> tuple[np.ndarray, np.ndarray]:
         """
         Compute eigenfrequencies and eigenmodes of the oscillator chain.
         
         Solves the generalized eigenvalue problem: K * v = (omega^2 * M) * v
         where K is stiffness matrix, M is mass matrix (diagonal).
         
+        Args:
+            n_modes: If given, compute only the n_modes lowest modes
+                (LAPACK stebz/stein on the index range), which is cheaper
+                than the full spectrum for long chains.
+        
         Returns:
             omega: Array of eigenfrequencies (sorted, >= 0).
-            modes: Matrix of eigenvectors (n, n), each column is a mode.
+            modes: Matrix of eigenvectors (n, n_modes), each column is a mode.
         """
-        K = self.stiffness_matrix()
-        
-        # Mass matrix
-        m_arr = np.asarray(self.m)
-        if m_arr.ndim == 0:
-            # Uniform mass
-            M = np.diag(np.full(self.n, float(m_arr)))
+        # K and M are tridiagonal/diagonal, so M^-1/2 K M^-1/2 is a symmetric
+        # tridiagonal matrix: solve it with eigh_tridiagonal (LAPACK stemr,
+        # O(n^2)) without building dense K/M.
+        k_vals = self._spring_constants()
+        m_vec = np.broadcast_to(np.asarray(self.m, dtype=float), (self.n,))
+        inv_sqrt_m = 1.0 / np.sqrt(m_vec)
+        
+        d = (k_vals[:-1] + k_vals[1:]) * (inv_sqrt_m * inv_sqrt_m)
+        e = -k_vals[1:-1] * inv_sqrt_m[:-1] * inv_sqrt_m[1:]
+        
+        if n_modes is not None and n_modes < self.n:
+            eigenvalues, u = scipy.linalg.eigh_tridiagonal(
+                d, e, select="i", select_range=(0, n_modes - 1),
+                check_finite=False,
+            )
         else:
-            M = np.diag(m_arr)
-            
-        # Solve generalized eigenvalue problem
-        # K * v = lambda * M * v
-        # lambda = omega^2
-        eigenvalues, eigenvectors = scipy.linalg.eigh(K, b=M)
+            eigenvalues, u = scipy.linalg.eigh_tridiagonal(
+                d, e, lapack_driver="stemr", check_finite=False
+            )
+        
+        # Back to generalized eigenvectors: v = M^-1/2 u (M-orthonormal,
+        # as returned by scipy.linalg.eigh(K, b=M))
+        eigenvectors = u * inv_sqrt_m[:, None]
         
         # Convert eigenvalues to frequencies
         # lambda = omega^2 => omega = sqrt(lambda)
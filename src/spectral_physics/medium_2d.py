@@ -2,7 +2,155 @@ import numpy as np
 import scipy.linalg
 import scipy.sparse
 import scipy.sparse.linalg
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+@lru_cache(maxsize=16)
+def _stencil_indices(nx: int, ny: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Индексы (rows, cols) ненулевых элементов 5-точечного шаблона.
+    
+    Порядок совпадает с данными в OscillatorGrid2D.stiffness_matrix:
+    диагональ, право, лево, низ, верх. Зависит только от формы сетки,
+    поэтому кэшируется между сборками (свипы по параметрам, NDT-сэмплы).
+    """
+    idx = np.arange(nx * ny).reshape(ny, nx)
+    left, right = idx[:, :-1].ravel(), idx[:, 1:].ravel()
+    up, down = idx[:-1, :].ravel(), idx[1:, :].ravel()
+    
+    rows = np.concatenate([idx.ravel(), left, right, up, down])
+    cols = np.concatenate([idx.ravel(), right, left, down, up])
+    rows.setflags(write=False)
+    cols.setflags(write=False)
+    return rows, cols
+
+
+def _dirichlet_chain_modes(
+    n: int,
+    k: float,
+    dtype: type | np.dtype = np.float64,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Аналитические моды однородной цепочки из n узлов с закреплёнными концами
+    (трёхдиагональная матрица 2k на диагонали, -k вне неё):
+    
+        lambda_p = 4k sin^2(p pi / (2(n+1))),
+        v_p[j]   = sqrt(2/(n+1)) sin(p pi (j+1) / (n+1)),  p = 1..n.
+    
+    Собственные значения по возрастанию, векторы ортонормированы.
+    """
+    p = np.arange(1, n + 1)
+    lam = 4.0 * k * np.sin(p * np.pi / (2 * (n + 1))) ** 2
+    j = np.arange(1, n + 1)
+    v = np.sqrt(2.0 / (n + 1)) * np.sin(np.outer(j, p) * np.pi / (n + 1))
+    return lam.astype(dtype), v.astype(dtype)
+
+
+def _fast_eigh(
+    K: np.ndarray,
+    m_vec: np.ndarray,
+    n_modes: int | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Плотное решение K v = lambda diag(m_vec) v.
+    
+    M диагональна, поэтому задача сводится к стандартной для
+    A = M^-1/2 K M^-1/2 (без разложения Холецкого M внутри eigh).
+    Полный спектр - divide-and-conquer (driver="evd"), часть спектра -
+    MRRR (driver="evr"); явный driver не зависит от эвристик версии scipy.
+    Векторы возвращаются M-ортонормированными: v = M^-1/2 u.
+    """
+    N = len(m_vec)
+    # float32 только если и K, и массы float32 (см. OscillatorGrid2D.dtype)
+    dtype = np.result_type(K.dtype, m_vec.dtype, np.float32)
+    inv_sqrt_m = 1.0 / np.sqrt(np.asarray(m_vec, dtype=dtype))
+    A = np.array(K, dtype=dtype, order="C")
+    A *= inv_sqrt_m[:, None]
+    A *= inv_sqrt_m[None, :]
+    
+    if n_modes is not None and n_modes < N:
+        eigvals, u = scipy.linalg.eigh(
+            A, subset_by_index=(0, n_modes - 1), driver="evr",
+            overwrite_a=True, check_finite=False,
+        )
+    else:
+        eigvals, u = scipy.linalg.eigh(
+            A, driver="evd", overwrite_a=True, check_finite=False,
+        )
+    
+    return eigvals, u * inv_sqrt_m[:, None]
+
+
+def _gpu_modes(
+    K: scipy.sparse.spmatrix,
+    m_vec: np.ndarray,
+    n_modes: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Нижние n_modes мод K v = omega^2 diag(m_vec) v на GPU (cupy).
+    
+    cupyx eigsh не поддерживает M и shift-invert, поэтому решается
+    стандартная задача для A = M^-1/2 K M^-1/2 с which="SA".
+    """
+    try:
+        import cupy
+        import cupyx.scipy.sparse
+        import cupyx.scipy.sparse.linalg
+    except ImportError as e:
+        raise ImportError("backend='gpu' requires cupy to be installed") from e
+    
+    inv_sqrt_m = 1.0 / np.sqrt(m_vec)
+    S = scipy.sparse.diags(inv_sqrt_m)
+    A = cupyx.scipy.sparse.csr_matrix((S @ K @ S).tocsr())
+    
+    eigvals, u = cupyx.scipy.sparse.linalg.eigsh(A, k=n_modes, which="SA")
+    eigvals = cupy.asnumpy(eigvals)
+    u = cupy.asnumpy(u)
+    
+    order = np.argsort(eigvals)
+    eigvals = np.maximum(eigvals[order], 0.0)
+    # v = M^-1/2 u
+    return np.sqrt(eigvals), u[:, order] * inv_sqrt_m[:, None]
+
+
+def _generalized_modes(
+    K: scipy.sparse.spmatrix,
+    m_vec: np.ndarray,
+    n_modes: int | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Нижние моды задачи K v = omega^2 diag(m_vec) v.
+    
+    Для n_modes < N/2 - разреженный eigsh (shift-invert вокруг 0),
+    иначе плотный _fast_eigh. Вынесено из OscillatorGrid2D.eigenmodes, чтобы
+    собранную один раз K можно было переиспользовать с разными массами.
+    """
+    N = len(m_vec)
+    if n_modes is not None and n_modes < 0.5 * N:
+        # Shift-invert: нижние собственные значения становятся
+        # наибольшими по модулю для (K - sigma*M)^-1 M
+        M = scipy.sparse.diags(m_vec, format="csr")
+        # Фиксированный стартовый вектор: результат воспроизводим
+        # (важно для вырожденных мод), но не симметричен по сетке
+        v0 = np.random.default_rng(0).uniform(0.5, 1.5, N).astype(K.dtype)
+        # Допуск не меньше точности типа (для float32 ~1e-6)
+        tol = max(1e-8, 10 * np.finfo(K.dtype).eps)
+        eigvals, eigvecs = scipy.sparse.linalg.eigsh(
+            K, k=n_modes, M=M,
+            sigma=0.0, which="LM", mode="normal",
+            tol=tol, v0=v0,
+        )
+        order = np.argsort(eigvals)
+        eigvals = eigvals[order]
+        eigvecs = eigvecs[:, order]
+    else:
+        eigvals, eigvecs = _fast_eigh(K.toarray(), m_vec, n_modes)
+        
+    eigvals = np.maximum(eigvals, 0.0)
+    omega = np.sqrt(eigvals) # lambda = omega^2 (mass is already in M)
+    
+    return omega, eigvecs
+
 
 @dataclass
 class OscillatorGrid2D:
@@ -35,194 +183,274 @@ class OscillatorGrid2D:
     # This is unambiguous.
     
     ky_map: np.ndarray | None = None
+    
+    # Тип данных K, масс, мод и LDOS. float32 вдвое сокращает память и
+    # трафик, точности хватает для NDT; float64 (по умолчанию) - эталон.
+    dtype: type | np.dtype = np.float64
+
+    # Моды eigenmodes/ldos_map: (отпечаток параметров сетки,
+    # {n_modes: (omega, modes)}). Повторные запросы на той же сетке
+    # (свипы по окнам частот, профиль и проверка NDT) решают задачу один раз.
+    _modes_cache: tuple[tuple, dict] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
-    def stiffness_matrix(self) -> np.ndarray:
+    def __post_init__(self):
+        """Привести dtype к np.dtype (принимаются тип, np.dtype и строка)."""
+        self.dtype = np.dtype(self.dtype)
+
+    def _fingerprint(self) -> tuple:
+        """Отпечаток параметров, от которых зависят моды (включая карты)."""
+        def key(a):
+            return None if a is None else (a.shape, np.asarray(a).tobytes())
+        return (
+            self.nx, self.ny, self.kx, self.ky, self.m, np.dtype(self.dtype),
+            key(self.mass_map), key(self.kx_map), key(self.ky_map),
+        )
+
+    def _edge_stiffness(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Жёсткости пружин по рёбрам сетки и диагональ 5-точечного шаблона.
+        
+        Возвращает:
+            k_h: (ny, nx-1) - пружины (i, j) <-> (i, j+1)
+            k_v: (ny-1, nx) - пружины (i, j) <-> (i+1, j)
+            diag: (ny, nx) - сумма жёсткостей всех пружин узла
+                  (включая пружины к стенкам с глобальными kx / ky)
         """
-        Собрать матрицу жёсткости размера (nx*ny, nx*ny).
+        nx, ny = self.nx, self.ny
+        dtype = self.dtype
+        kx_arr = (
+            np.asarray(self.kx_map, dtype=dtype) if self.kx_map is not None
+            else np.full((ny, nx), self.kx, dtype=dtype)
+        )
+        ky_arr = (
+            np.asarray(self.ky_map, dtype=dtype) if self.ky_map is not None
+            else np.full((ny, nx), self.ky, dtype=dtype)
+        )
+        
+        # Внутренние пружины
+        k_h = kx_arr[:, :-1]
+        k_v = ky_arr[:-1, :]
+        
+        diag = np.zeros((ny, nx), dtype=dtype)
+        diag[:, :-1] += k_h
+        diag[:, 1:] += k_h
+        diag[:-1, :] += k_v
+        diag[1:, :] += k_v
+        # Пружины к стенкам
+        diag[:, 0] += self.kx
+        diag[:, -1] += self.kx
+        diag[0, :] += self.ky
+        diag[-1, :] += self.ky
+        
+        return k_h, k_v, diag
+
+    def stiffness_matrix(self) -> scipy.sparse.csr_matrix:
+        """
+        Собрать матрицу жёсткости размера (nx*ny, nx*ny) в формате CSR.
         Используется 5-точечный шаблон (центр, лево, право, верх, низ).
         
         Индексация: k = i * nx + j, где i - строка (0..ny-1), j - столбец (0..nx-1).
+        
+        Связи:
+        - kx_map[i, j] - пружина между (i, j) и (i, j+1),
+        - ky_map[i, j] - пружина между (i, j) и (i+1, j),
+        - пружины к стенкам (закреплённые края) имеют глобальные kx / ky.
+        
+        Матрица собирается сразу из триплетов (row, col, value) без
+        плотного промежуточного массива: O(N) памяти вместо O(N^2).
         """
-        N = self.nx * self.ny
-        K = np.zeros((N, N))
-        
-        # Helper to get stiffness
-        def get_kx(i, j):
-            if self.kx_map is not None:
-                return self.kx_map[i, j]
-            return self.kx
-            
-        def get_ky(i, j):
-            if self.ky_map is not None:
-                return self.ky_map[i, j]
-            return self.ky
-        
-        for i in range(self.ny):
-            for j in range(self.nx):
-                k = i * self.nx + j
-                
-                diag_val = 0.0
-                
-                # Link to Right (j+1)
-                if j < self.nx - 1:
-                    kval = get_kx(i, j)
-                    k_right = i * self.nx + (j + 1)
-                    
-                    K[k, k] += kval
-                    K[k_right, k_right] += kval
-                    K[k, k_right] = -kval
-                    K[k_right, k] = -kval
-                else:
-                    # Boundary condition: fixed wall on the right?
-                    # Original code: 
-                    # diag_val += self.kx (always added for left/right)
-                    # If we follow original logic: "spring exists always"
-                    # For right boundary: spring connects to wall.
-                    kval = get_kx(i, j)
-                    K[k, k] += kval
-                    
-                # Link to Left (j-1)
-                # Handled by (j-1)'s link to Right?
-                # No, we iterate all nodes.
-                # Let's be careful not to double count if we iterate all.
-                # Standard assembly: iterate elements (springs) or nodes?
-                # If iterating nodes, we add contribution of all connected springs.
-                pass
-
-        # Re-implementing with clear "spring-based" assembly to avoid confusion
-        K = np.zeros((N, N))
-        
-        # 1. Horizontal springs
-        for i in range(self.ny):
-            for j in range(self.nx):
-                # Spring to the right of (i,j)
-                # Connects (i,j) and (i,j+1) OR (i,j) and Wall
-                
-                k_curr = i * self.nx + j
-                kval = get_kx(i, j)
-                
-                # Add to current node diagonal
-                K[k_curr, k_curr] += kval
-                
-                if j < self.nx - 1:
-                    k_right = i * self.nx + (j + 1)
-                    K[k_right, k_right] += kval
-                    K[k_curr, k_right] = -kval
-                    K[k_right, k_curr] = -kval
-                # If j == nx-1, it connects to wall (displacement 0), so only diagonal term remains.
-                
-                # Wait, what about the spring to the LEFT of (i,0)?
-                # We need a spring there too if boundaries are fixed.
-                # My previous logic: "diag_val += self.kx" implied spring to left and right.
-                # So we need to iterate j from -1 to nx-1?
-                # Let's assume:
-                # Node j has spring to j+1 (defined by kx_map[i,j])
-                # Node j has spring to j-1 (defined by kx_map[i,j-1]?)
-                # Boundary: Wall -> Node 0. Let's say this is defined by kx_map[i, -1] ?? No.
-                
-                # Let's assume kx_map has shape (ny, nx+1) to cover all intervals?
-                # Or just use kx_map for internal links and kx for boundaries?
-                # Or simpler: kx_map[i,j] is the spring to the RIGHT of node j.
-                # And we assume default kx for the spring to the LEFT of node 0.
-                pass
-        
-        # Let's stick to the node-based logic but be consistent.
-        # Node (i,j) is connected to:
-        # Left: (i, j-1). Stiffness? Use get_kx(i, j-1) if j>0. If j=0, use get_kx(i, -1)?
-        # Right: (i, j+1). Stiffness? Use get_kx(i, j).
-        
-        # To make it symmetric and simple:
-        # kx_map[i, j] is the stiffness of the link between (i,j) and (i,j+1).
-        # For boundary springs (Wall-0 and (N-1)-Wall), let's use self.kx (global).
-        
-        K = np.zeros((N, N))
-        
-        for i in range(self.ny):
-            for j in range(self.nx):
-                k_curr = i * self.nx + j
-                
-                # --- Horizontal ---
-                
-                # Link Left: (i, j-1) <-> (i, j)
-                if j == 0:
-                    k_left_val = self.kx # Wall
-                else:
-                    k_left_val = get_kx(i, j-1)
-                    k_left = i * self.nx + (j - 1)
-                    K[k_curr, k_left] = -k_left_val
-                
-                K[k_curr, k_curr] += k_left_val
-                
-                # Link Right: (i, j) <-> (i, j+1)
-                if j == self.nx - 1:
-                    k_right_val = self.kx # Wall
-                else:
-                    k_right_val = get_kx(i, j)
-                    k_right = i * self.nx + (j + 1)
-                    K[k_curr, k_right] = -k_right_val
-                    
-                K[k_curr, k_curr] += k_right_val
-                
-                # --- Vertical ---
-                
-                # Link Up: (i-1, j) <-> (i, j)
-                if i == 0:
-                    k_up_val = self.ky # Wall
-                else:
-                    k_up_val = get_ky(i-1, j)
-                    k_up = (i - 1) * self.nx + j
-                    K[k_curr, k_up] = -k_up_val
-                    
-                K[k_curr, k_curr] += k_up_val
-                
-                # Link Down: (i, j) <-> (i+1, j)
-                if i == self.ny - 1:
-                    k_down_val = self.ky # Wall
-                else:
-                    k_down_val = get_ky(i, j)
-                    k_down = (i + 1) * self.nx + j
-                    K[k_curr, k_down] = -k_down_val
-                    
-                K[k_curr, k_curr] += k_down_val
-                
-        return K
-
-    def eigenmodes(self, n_modes: int | None = None) -> tuple[np.ndarray, np.ndarray]:
+        nx, ny = self.nx, self.ny
+        N = nx * ny
+        
+        if self.kx_map is None and self.ky_map is None and nx > 1 and ny > 1:
+            # Однородные жёсткости: 5 диагоналей, у каждого узла 2kx + 2ky
+            # (пружины к стенкам тоже kx / ky). При nx == 1 или ny == 1
+            # смещения диагоналей совпадают - тогда общий путь ниже.
+            dtype = self.dtype
+            off_x = np.full(N - 1, -self.kx, dtype=dtype)
+            off_x[nx - 1::nx] = 0.0  # нет связи между концом строки и началом следующей
+            off_y = np.full(N - nx, -self.ky, dtype=dtype)
+            K = scipy.sparse.diags(
+                [np.full(N, 2.0 * (self.kx + self.ky), dtype=dtype),
+                 off_x, off_x, off_y, off_y],
+                [0, -1, 1, -nx, nx],
+                shape=(N, N), format="csr", dtype=dtype,
+            )
+            K.eliminate_zeros()
+            return K
+        
+        rows, cols = _stencil_indices(nx, ny)
+        k_h, k_v, diag = self._edge_stiffness()
+        
+        k_h = k_h.ravel()
+        k_v = k_v.ravel()
+        data = np.concatenate([diag.ravel(), -k_h, -k_h, -k_v, -k_v])
+        
+        return scipy.sparse.coo_matrix((data, (rows, cols)), shape=(N, N)).tocsr()
+
+    def stiffness_operator(
+        self,
+        scale: np.ndarray | None = None,
+    ) -> scipy.sparse.linalg.LinearOperator:
+        """
+        Матрично-свободный оператор v -> K v (5-точечный шаблон).
+        
+        K не хранится: matvec работает прямо с картой смещений (ny, nx)
+        и жёсткостями рёбер, посчитанными один раз при создании оператора.
+        
+        Args:
+            scale: Необязательный диагональный множитель s (длины nx*ny);
+                   тогда оператор применяет s * K (s * v).
+        """
+        nx, ny = self.nx, self.ny
+        N = nx * ny
+        k_h, k_v, diag = self._edge_stiffness()
+        dtype = self.dtype
+        s = None if scale is None else np.asarray(scale, dtype=dtype).reshape(ny, nx)
+        
+        def matvec(v: np.ndarray) -> np.ndarray:
+            V = np.asarray(v, dtype=dtype).reshape(ny, nx)
+            if s is not None:
+                V = V * s
+            out = diag * V
+            out[:, :-1] -= k_h * V[:, 1:]
+            out[:, 1:] -= k_h * V[:, :-1]
+            out[:-1, :] -= k_v * V[1:, :]
+            out[1:, :] -= k_v * V[:-1, :]
+            if s is not None:
+                out *= s
+            return out.ravel()
+        
+        return scipy.sparse.linalg.LinearOperator(
+            (N, N), matvec=matvec, rmatvec=matvec, dtype=dtype
+        )
+
+    def _kronecker_modes(
+        self,
+        n_modes: int | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Моды однородной сетки (без *_map) через сумму Кронекера.
+        
+        K = I_y (x) K_x + K_y (x) I_x, где K_x, K_y - трёхдиагональные
+        матрицы 1D цепочек с закреплёнными концами. Собственные значения
+        K - все суммы lambda_p + mu_q, векторы - kron(vy[:, q], vx[:, p]).
+        1D моды известны аналитически (_dirichlet_chain_modes), так что
+        собственная задача не решается вовсе: O(N log N + N * n_modes).
+        """
+        nx, ny = self.nx, self.ny
+        N = nx * ny
+        dtype = self.dtype
+        
+        lam_x, vx = _dirichlet_chain_modes(nx, self.kx, dtype)
+        lam_y, vy = _dirichlet_chain_modes(ny, self.ky, dtype)
+        
+        # lam[q, p] = mu_q + lambda_p, плоский индекс q * nx + p
+        lam = (lam_y[:, None] + lam_x[None, :]).ravel()
+        order = np.argsort(lam, kind="stable")
+        if n_modes is not None and n_modes < N:
+            order = order[:n_modes]
+        q, p = np.divmod(order, nx)
+        
+        # Узел (i, j) имеет индекс i * nx + j -> компонента vy[i, q] * vx[j, p]
+        eigvecs = (vy[:, None, q] * vx[None, :, p]).reshape(N, -1)
+        # M = m I: M-ортонормировка
+        m = np.asarray(self.m, dtype=dtype)
+        eigvecs /= np.sqrt(m)
+        
+        omega = np.sqrt(np.maximum(lam[order], 0.0) / m)
+        return omega, eigvecs
+
+    def eigenmodes(
+        self,
+        n_modes: int | None = None,
+        matrix_free: bool = False,
+        backend: str = "cpu",
+    ) -> tuple[np.ndarray, np.ndarray]:
         """
         Найти собственные частоты и моды.
+        
+        Решается обобщённая задача K v = omega^2 M v, M = diag(масс).
+        Если нужно n_modes < N/2 нижних мод, используется разреженный
+        ARPACK (eigsh) в режиме shift-invert вокруг sigma = 0; иначе -
+        плотный eigh. Моды M-ортонормированы, частоты по возрастанию.
+        
+        Для однородной сетки (без mass_map / kx_map / ky_map) задача
+        разделяется по осям, см. _kronecker_modes.
+        
+        При matrix_free=True (и n_modes < N - 1) K не собирается вовсе:
+        eigsh итерирует stiffness_operator() для M^-1/2 K M^-1/2.
+        Памяти O(N) без разреженной матрицы, но без shift-invert
+        сходимость к нижним модам медленнее.
+        
+        backend="gpu" (нужен cupy, n_modes < N - 1) решает ту же задачу
+        для M^-1/2 K M^-1/2 через cupyx.scipy.sparse.linalg.eigsh;
+        результат возвращается как массивы numpy.
+        
+        Результат пути по умолчанию (cpu, без matrix_free) кэшируется по
+        n_modes, пока не меняются параметры сетки (см. _cached_modes);
+        вызывающий получает копии.
         """
-        K = self.stiffness_matrix()
+        if backend not in ("cpu", "gpu"):
+            raise ValueError(f"Unknown backend '{backend}', expected 'cpu' or 'gpu'")
+        
+        if backend == "cpu" and not matrix_free:
+            omega, modes = self._cached_modes(n_modes)
+            return omega.copy(), modes.copy()
+        return self._solve_modes(n_modes, matrix_free, backend)
+
+    def _cached_modes(self, n_modes: int | None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        (omega, modes) пути по умолчанию из кэша (без копирования).
+        Кэш сбрасывается при любом изменении параметров сетки,
+        включая правку карт дефектов на месте.
+        """
+        fingerprint = self._fingerprint()
+        if self._modes_cache is None or self._modes_cache[0] != fingerprint:
+            self._modes_cache = (fingerprint, {})
+        cache = self._modes_cache[1]
+        if n_modes not in cache:
+            cache[n_modes] = self._solve_modes(n_modes, False, "cpu")
+        return cache[n_modes]
+
+    def _solve_modes(
+        self,
+        n_modes: int | None,
+        matrix_free: bool,
+        backend: str,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Решить задачу на собственные значения (см. eigenmodes)."""
+        N = self.nx * self.ny
+        
+        if self.mass_map is None and self.kx_map is None and self.ky_map is None:
+            return self._kronecker_modes(n_modes)
         
         # Mass matrix M
         if self.mass_map is not None:
-            m_vec = self.mass_map.flatten()
-        else:
-            m_vec = np.full(self.nx * self.ny, self.m)
-            
-        # Generalized eigenvalue problem: K v = lambda M v
-        # Since M is diagonal, we can transform to standard EVP:
-        # M^(-1/2) K M^(-1/2) u = lambda u, where v = M^(-1/2) u
-        # Or just use eigh with b argument (if positive definite)
-        
-        # Let's use eigh(K, b=M) if possible, but M is diagonal array.
-        # scipy.linalg.eigh supports b as matrix.
-        M = np.diag(m_vec)
-        
-        if n_modes is not None and n_modes < len(m_vec):
-             eigvals, eigvecs = scipy.linalg.eigh(
-                K, b=M,
-                subset_by_index=(0, n_modes - 1)
-            )
+            m_vec = np.asarray(self.mass_map, dtype=self.dtype).ravel()
         else:
-            eigvals, eigvecs = scipy.linalg.eigh(K, b=M)
-            
-        eigvals = np.maximum(eigvals, 0.0)
-        omega = np.sqrt(eigvals) # lambda = omega^2 (mass is already in M)
+            m_vec = np.full(N, self.m, dtype=self.dtype)
         
-        return omega, eigvecs
-        omega = np.sqrt(eigvals / self.m)
+        if backend == "gpu" and n_modes is not None and n_modes < N - 1:
+            return _gpu_modes(self.stiffness_matrix(), m_vec, n_modes)
         
-        return omega, eigvecs
+        if matrix_free and n_modes is not None and n_modes < N - 1:
+            inv_sqrt_m = 1.0 / np.sqrt(m_vec)
+            op = self.stiffness_operator(scale=inv_sqrt_m)
+            v0 = np.random.default_rng(0).uniform(0.5, 1.5, N).astype(self.dtype)
+            tol = max(1e-8, 10 * np.finfo(self.dtype).eps)
+            eigvals, u = scipy.sparse.linalg.eigsh(
+                op, k=n_modes, which="SA", tol=tol, v0=v0
+            )
+            order = np.argsort(eigvals)
+            eigvals = np.maximum(eigvals[order], 0.0)
+            # v = M^-1/2 u
+            eigvecs = u[:, order] * inv_sqrt_m[:, None]
+            return np.sqrt(eigvals), eigvecs
+        
+        return _generalized_modes(self.stiffness_matrix(), m_vec, n_modes)
 
     def ldos_map(
         self,
@@ -232,10 +460,14 @@ class OscillatorGrid2D:
         """
         Вернуть LDOS-карту формы (ny, nx) в заданном частотном окне.
         Использует eigenmodes(...) + ldos_from_modes(...).
+
+        Моды кэшируются по n_modes, пока не меняются параметры сетки
+        (в том числе карты дефектов): повторный вызов с другим окном
+        только заново выбирает моды.
         """
         from .ldos import ldos_from_modes
         
-        omega, modes = self.eigenmodes(n_modes=n_modes)
+        omega, modes = self._cached_modes(n_modes)
         ldos_flat = ldos_from_modes(modes, omega, freq_window)
         
         return ldos_flat.reshape((self.ny, self.nx))
@@ -1,6 +1,10 @@
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from .medium_2d import OscillatorGrid2D
+from functools import partial
+import scipy.sparse
+from .medium_2d import OscillatorGrid2D, _generalized_modes
+from .ldos import ldos_from_modes
 
 @dataclass
 class NDTProfile:
@@ -12,12 +16,84 @@ class NDTProfile:
     ldos_mean: np.ndarray   # Mean LDOS map (ny, nx)
     ldos_std: np.ndarray    # Std dev of LDOS map (ny, nx)
 
+def _perturbed_ldos(
+    mass_map: np.ndarray,
+    K: scipy.sparse.spmatrix,
+    n_modes: int,
+    freq_window: tuple[float, float],
+) -> np.ndarray:
+    """
+    LDOS map for a fixed stiffness matrix K and a perturbed mass map.
+    Module-level so that it can be shipped to worker processes.
+    """
+    omega, modes = _generalized_modes(K, mass_map.ravel(), n_modes)
+    return ldos_from_modes(modes, omega, freq_window).reshape(mass_map.shape)
+
+# Upper bound on the scaled-stiffness stack held by _perturbed_ldos_dense
+_DENSE_BATCH_BYTES = 64 << 20
+
+def _perturbed_ldos_dense(
+    mass_maps: np.ndarray,
+    K: scipy.sparse.spmatrix,
+    n_modes: int | None,
+    freq_window: tuple[float, float],
+):
+    """
+    Yield LDOS maps for a stack of mass maps, solving the dense
+    eigenproblems of a whole block of samples in one batched eigh call.
+    Used where _generalized_modes would take its dense branch anyway;
+    blocks are sized so the (block, N, N) stack stays under
+    _DENSE_BATCH_BYTES.
+    """
+    shape = mass_maps.shape[1:]
+    N = K.shape[0]
+    dtype = np.result_type(K.dtype, mass_maps.dtype, np.float32)
+    K_dense = K.toarray().astype(dtype, copy=False)
+    k = N if n_modes is None else min(n_modes, N)
+    w_min, w_max = freq_window
+    block = max(1, _DENSE_BATCH_BYTES // (N * N * np.dtype(dtype).itemsize))
+    
+    for start in range(0, mass_maps.shape[0], block):
+        m_vecs = mass_maps[start:start + block].reshape(-1, N).astype(dtype, copy=False)
+        inv_sqrt_m = 1.0 / np.sqrt(m_vecs)
+        # M^-1/2 K M^-1/2 for every sample of the block
+        A = K_dense * inv_sqrt_m[:, :, None]
+        A *= inv_sqrt_m[:, None, :]
+        eigvals, u = np.linalg.eigh(A)
+        
+        omega = np.sqrt(np.maximum(eigvals[:, :k], 0.0))
+        modes = u[:, :, :k] * inv_sqrt_m[:, :, None]
+        in_window = ((omega >= w_min) & (omega <= w_max)).astype(dtype)
+        ldos = np.einsum("bpm,bpm,bm->bp", modes, modes, in_window)
+        yield from ldos.reshape((-1,) + shape)
+
+def _welford(ldos_maps) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Running mean and (population) std of an iterable of LDOS maps.
+    Welford's update keeps O(1) maps in memory instead of stacking all samples.
+    """
+    count = 0
+    for ldos in ldos_maps:
+        count += 1
+        if count == 1:
+            # Accumulate in the dtype of the maps (float32 grids stay float32)
+            mean = np.array(ldos)
+            m2 = np.zeros_like(mean)
+            continue
+        delta = ldos - mean
+        mean += delta / count
+        m2 += delta * (ldos - mean)
+    if count == 0:
+        raise ValueError("Cannot compute LDOS statistics from zero samples")
+    return mean, np.sqrt(m2 / count)
+
 def build_ndt_profile(
     grid: OscillatorGrid2D,
     n_modes: int,
     freq_window: tuple[float, float],
     n_samples: int = 1,
-    noise_level: float = 0.0
+    noise_level: float = 0.0,
+    n_jobs: int = 1,
 ) -> NDTProfile:
     """
     Build an NDT profile by sampling the grid's LDOS.
@@ -28,50 +104,63 @@ def build_ndt_profile(
         freq_window: Frequency window (min, max) for LDOS.
         n_samples: Number of samples to average (useful if adding noise).
         noise_level: Amplitude of random mass noise to add for robustness.
+            Mass maps, LDOS samples and the profile use grid.dtype.
+        n_jobs: Number of worker processes for the noisy samples
+            (1 = serial, -1 = all CPUs). Samples are independent
+            eigenproblems; with n_jobs > 1 consider limiting BLAS threads
+            (e.g. OMP_NUM_THREADS=1) to avoid oversubscription. When
+            n_modes covers at least half the spectrum the samples are
+            solved in-process as batched dense eigenproblems instead.
         
     Returns:
         NDTProfile containing mean and std of LDOS.
+    
+    Raises:
+        ValueError: If n_samples < 1.
     """
-    ldos_maps = []
+    if n_samples < 1:
+        raise ValueError(f"n_samples must be >= 1, got {n_samples}")
     
     base_mass = grid.m
     # If grid has mass_map, use it as base
     if grid.mass_map is not None:
-        base_mass_map = grid.mass_map.copy()
+        base_mass_map = np.array(grid.mass_map, dtype=grid.dtype)
     else:
-        base_mass_map = np.full((grid.ny, grid.nx), base_mass)
+        base_mass_map = np.full((grid.ny, grid.nx), base_mass, dtype=grid.dtype)
+        
+    if noise_level > 0:
+        # Perturb mass slightly. All noise is drawn up front from the global
+        # generator (same stream as drawing per sample), so the result does
+        # not depend on n_jobs.
+        noise = np.random.normal(
+            0, noise_level, size=(n_samples,) + base_mass_map.shape
+        )
+        # Ensure mass stays positive
+        mass_maps = np.maximum(base_mass_map + noise, 1e-3).astype(grid.dtype)
         
-    for _ in range(n_samples):
-        # Perturb mass slightly if noise requested
-        if noise_level > 0:
-            noise = np.random.normal(0, noise_level, size=base_mass_map.shape)
-            current_mass = base_mass_map + noise
-            # Ensure mass stays positive
-            current_mass = np.maximum(current_mass, 1e-3)
-            
-            # Create temp grid with perturbed mass
-            temp_grid = OscillatorGrid2D(
-                nx=grid.nx, ny=grid.ny,
-                kx=grid.kx, ky=grid.ky,
-                m=grid.m, # Base scalar m, but we override with map
-                mass_map=current_mass,
-                kx_map=grid.kx_map,
-                ky_map=grid.ky_map
+        # Only masses change between samples: assemble K once
+        K = grid.stiffness_matrix()
+        sample = partial(
+            _perturbed_ldos, K=K, n_modes=n_modes, freq_window=freq_window
+        )
+        if n_modes is None or n_modes >= 0.5 * K.shape[0]:
+            # Dense regime (small grids / most of the spectrum): batch the
+            # per-sample eigenproblems instead of solving them one by one
+            mean_ldos, std_ldos = _welford(
+                _perturbed_ldos_dense(mass_maps, K, n_modes, freq_window)
             )
-            ldos = temp_grid.ldos_map(n_modes=n_modes, freq_window=freq_window)
+        elif n_jobs == 1 or n_samples == 1:
+            mean_ldos, std_ldos = _welford(map(sample, mass_maps))
         else:
-            # No noise, just calc once (or n_samples times same result)
-            ldos = grid.ldos_map(n_modes=n_modes, freq_window=freq_window)
-            
-        ldos_maps.append(ldos)
-        
-    ldos_stack = np.array(ldos_maps)
-    
-    mean_ldos = np.mean(ldos_stack, axis=0)
-    if n_samples > 1 and noise_level > 0:
-        std_ldos = np.std(ldos_stack, axis=0)
+            max_workers = None if n_jobs < 0 else n_jobs
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                mean_ldos, std_ldos = _welford(pool.map(sample, mass_maps))
+        if n_samples == 1:
+            # If single sample, std is undefined/zero.
+            std_ldos = np.zeros_like(mean_ldos)
     else:
-        # If single sample, std is undefined/zero. 
+        # No noise: every sample is the same map, compute it once
+        mean_ldos = grid.ldos_map(n_modes=n_modes, freq_window=freq_window)
         std_ldos = np.zeros_like(mean_ldos)
         
     return NDTProfile(
@@ -92,15 +181,15 @@ def score_ndt_state(
     If profile has valid std, use Z-score: |x - mean| / (std + eps).
     Otherwise, use absolute difference: |x - mean|.
     """
-    diff = np.abs(ldos_current - profile.ldos_mean)
+    # One output buffer, all further steps in place
+    score = np.subtract(ldos_current, profile.ldos_mean)
+    np.abs(score, out=score)
     
     # Check if we have valid std (non-zero max)
     if np.max(profile.ldos_std) > epsilon:
         # Z-score like metric
-        score = diff / (profile.ldos_std + epsilon)
-    else:
-        # Just difference
-        score = diff
+        denom = np.add(profile.ldos_std, epsilon)
+        np.divide(score, denom, out=score)
         
     return score
 
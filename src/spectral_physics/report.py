@@ -1,5 +1,7 @@
 from typing import Dict
 import datetime
+import io
+import numpy as np
 
 def generate_markdown_report(
     scores: Dict[str, float],
@@ -18,42 +20,42 @@ def generate_markdown_report(
     """
     timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
-    lines = [
-        f"# {title}",
-        f"",
-        f"**Date:** {timestamp}",
-        f"",
-        f"## Channel Status",
-        f"",
-        f"| Channel | Distance | Threshold | Status |",
-        f"|---------|----------|-----------|--------|"
-    ]
+    buf = io.StringIO()
+    buf.write(
+        f"# {title}\n"
+        f"\n"
+        f"**Date:** {timestamp}\n"
+        f"\n"
+        f"## Channel Status\n"
+        f"\n"
+        f"| Channel | Distance | Threshold | Status |\n"
+        f"|---------|----------|-----------|--------|\n"
+    )
     
-    any_anomaly = False
+    names = list(scores)
+    distances = np.array([scores[name] for name in names], dtype=float)
+    limits = np.array([thresholds.get(name, 0.0) for name in names], dtype=float)
+    is_anom = distances > limits
+    any_anomaly = bool(np.any(is_anom))
     
-    for name, distance in scores.items():
-        threshold = thresholds.get(name, 0.0)
-        is_anom = distance > threshold
-        status = "🔴 **ANOMALY**" if is_anom else "🟢 OK"
+    # Number formatting for all rows in one NumPy call each
+    dist_strs = np.char.mod("%.6f", distances)
+    thr_strs = np.char.mod("%.6f", limits)
+    for name, d_str, t_str, anom in zip(names, dist_strs, thr_strs, is_anom):
+        status = "🔴 **ANOMALY**" if anom else "🟢 OK"
+        buf.write(f"| `{name}` | {d_str} | {t_str} | {status} |\n")
         
-        if is_anom:
-            any_anomaly = True
-            
-        lines.append(
-            f"| `{name}` | {distance:.6f} | {threshold:.6f} | {status} |"
-        )
-        
-    lines.append("")
+    buf.write("\n")
     
     if any_anomaly:
-        lines.append("> [!WARNING]")
-        lines.append("> Anomalies detected! Please check the affected channels.")
+        buf.write("> [!WARNING]\n")
+        buf.write("> Anomalies detected! Please check the affected channels.")
     else:
-        lines.append("> [!NOTE]")
-        lines.append("> All systems nominal.")
+        buf.write("> [!NOTE]\n")
+        buf.write("> All systems nominal.")
         
     with open(out_path, 'w', encoding='utf-8') as f:
-        f.write("\n".join(lines))
+        f.write(buf.getvalue())
 
 
 def generate_ndt_report(
@@ -67,9 +69,6 @@ def generate_ndt_report(
     """
     Generate NDT report with defect statistics.
     """
-    import numpy as np
-    import datetime
-    
     timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
     n_defects = np.sum(mask)
@@ -79,44 +78,49 @@ def generate_ndt_report(
     max_score = np.max(scores)
     mean_score = np.mean(scores)
     
-    lines = [
-        f"# {title}",
-        f"",
-        f"**Date:** {timestamp}",
-        f"",
-        f"## Defect Statistics",
-        f"- **Defect Pixels:** {n_defects} / {total_pixels} ({defect_ratio:.2f}%)",
-        f"- **Max Defect Score:** {max_score:.4f}",
-        f"- **Mean Score:** {mean_score:.4f}",
-        f"",
-        f"## Defect Locations (Top 10)",
-        f"| X | Y | Score |",
-        f"|---|---|-------|"
-    ]
+    buf = io.StringIO()
+    buf.write(
+        f"# {title}\n"
+        f"\n"
+        f"**Date:** {timestamp}\n"
+        f"\n"
+        f"## Defect Statistics\n"
+        f"- **Defect Pixels:** {n_defects} / {total_pixels} ({defect_ratio:.2f}%)\n"
+        f"- **Max Defect Score:** {max_score:.4f}\n"
+        f"- **Mean Score:** {mean_score:.4f}\n"
+        f"\n"
+        f"## Defect Locations (Top 10)\n"
+        f"| X | Y | Score |\n"
+        f"|---|---|-------|\n"
+    )
     
     # Find top 10 defects
     if n_defects > 0:
-        flat_indices = np.argsort(scores.flatten())[::-1]
-        top_indices = flat_indices[:10]
+        # O(N) selection of the top-k instead of sorting the whole map
+        flat = scores.ravel()
+        k = min(10, flat.size)
+        top_k = np.argpartition(flat, flat.size - k)[flat.size - k:]
+        top_indices = top_k[np.argsort(flat[top_k], kind="stable")[::-1]]
         
-        ny, nx = scores.shape
-        for idx in top_indices:
-            y, x = np.unravel_index(idx, (ny, nx))
-            score = scores[y, x]
-            if mask[y, x]:
-                lines.append(f"| {x} | {y} | {score:.4f} |")
+        ys, xs = np.unravel_index(top_indices, scores.shape)
+        keep = mask[ys, xs]
+        ys, xs = ys[keep], xs[keep]
+        score_strs = np.char.mod("%.4f", scores[ys, xs])
+        buf.write("".join(
+            f"| {x} | {y} | {score} |\n"
+            for x, y, score in zip(xs.tolist(), ys.tolist(), score_strs)
+        ))
     else:
-        lines.append("| - | - | - |")
+        buf.write("| - | - | - |\n")
         
-    lines.append("")
+    buf.write("\n")
     
     if n_defects > 0:
-        lines.append("> [!WARNING]")
-        lines.append(f"> **{n_defects} defect pixels detected!** Check the map.")
+        buf.write("> [!WARNING]\n")
+        buf.write(f"> **{n_defects} defect pixels detected!** Check the map.")
     else:
-        lines.append("> [!NOTE]")
-        lines.append("> No defects detected.")
+        buf.write("> [!NOTE]\n")
+        buf.write("> No defects detected.")
         
     with open(out_path, 'w', encoding='utf-8') as f:
-        f.write("\n".join(lines))
-
+        f.write(buf.getvalue())
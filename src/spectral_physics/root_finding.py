@@ -1,7 +1,13 @@
+import math
 import numpy as np
+import scipy.optimize
 from typing import Callable, Tuple
 
 
+# Итераций без уменьшения |f(x)| до перехода на brentq
+_STALL_ITERS = 5
+
+
 def symmetric_newton(
     f: Callable[[float], float],
     x0: float,
@@ -9,6 +15,8 @@ def symmetric_newton(
     max_iter: int = 50,
     tol: float = 1e-10,
     tol_step: float = 1e-12,
+    bracket: Tuple[float, float] | None = None,
+    secant: bool = False,
 ) -> Tuple[float, int]:
     """
     Найти корень уравнения f(x) = 0 симметричным методом Ньютона,
@@ -27,6 +35,14 @@ def symmetric_newton(
         max_iter: максимальное число итераций
         tol: допуск по |f(x)|
         tol_step: допуск по величине шага |delta|
+        bracket: необязательный интервал (a, b) со сменой знака f;
+                 если задан, используется scipy.optimize.brentq
+                 (гарантированная сходимость, xtol=tol_step),
+                 а симметричный Ньютон остаётся для открытого поиска
+        secant: если True, после первой итерации производная берётся
+                секущей по двум последним точкам (без новых вызовов f):
+                1 вызов f за итерацию вместо 3. Симметричная разность
+                используется на первом шаге и при вырожденной секущей.
 
     Возвращает:
         x_root: найденное значение x, для которого f(x) ≈ 0
@@ -40,27 +56,77 @@ def symmetric_newton(
         - |f(x)| < tol
         - |delta| < tol_step (полезно на плоских участках)
         - достигнуто max_iter
+        
+        Значение f(x_new), посчитанное при проверке шага, переиспользуется
+        на следующей итерации: f вызывается 3 раза за итерацию, а не 4.
+        
+        Если |f(x)| не уменьшается _STALL_ITERS итераций подряд, а среди
+        пройденных точек уже есть пара со сменой знака f, поиск
+        завершается scipy.optimize.brentq на этом интервале
+        (гарантированная сходимость вместо дробления шага).
     """
+    if bracket is not None:
+        a, b = bracket
+        x_root, res = scipy.optimize.brentq(
+            f, a, b, xtol=tol_step, maxiter=max_iter,
+            full_output=True, disp=False,
+        )
+        return float(x_root), int(res.iterations)
+    
     x = float(x0)
     h = float(h0)
+    fx = None
+    x_prev = fx_prev = None
+    # Последние точки с f < 0 и f > 0 (для перехода на brentq)
+    x_neg = x_pos = None
+    best = np.inf
+    stall = 0
     
     for i in range(max_iter):
-        fx = f(x)
+        if fx is None:
+            fx = f(x)
         
         # Check convergence by function value
         if abs(fx) < tol:
             return x, i
         
+        if fx < 0:
+            x_neg = x
+        elif fx > 0:
+            x_pos = x
+        if abs(fx) < best:
+            best = abs(fx)
+            stall = 0
+        else:
+            stall += 1
+        
+        # Stagnation with a known sign change: finish with Brent
+        if stall >= _STALL_ITERS and x_neg is not None and x_pos is not None:
+            a, b = min(x_neg, x_pos), max(x_neg, x_pos)
+            x_root, res = scipy.optimize.brentq(
+                f, a, b, xtol=tol_step, maxiter=max_iter,
+                full_output=True, disp=False,
+            )
+            return float(x_root), min(i + int(res.iterations), max_iter)
+        
         # Check for divergence
         if abs(x) > 1e10:
             raise ValueError(f"Method diverged: |x| = {abs(x)} > 1e10")
         
-        # Symmetric difference derivative
-        # f'(x) ≈ (f(x + h) - f(x - h)) / (2h)
-        try:
-            df = (f(x + h) - f(x - h)) / (2 * h)
-        except Exception as e:
-            raise ValueError(f"Failed to compute derivative at x={x}: {e}")
+        df = None
+        if secant and x_prev is not None and x != x_prev:
+            # Secant slope from the previous iterate: no extra f calls
+            df = (fx - fx_prev) / (x - x_prev)
+            if abs(df) < 1e-14:
+                df = None
+        
+        if df is None:
+            # Symmetric difference derivative
+            # f'(x) ≈ (f(x + h) - f(x - h)) / (2h)
+            try:
+                df = (f(x + h) - f(x - h)) / (2 * h)
+            except Exception as e:
+                raise ValueError(f"Failed to compute derivative at x={x}: {e}")
         
         # Protect against division by near-zero derivative
         if abs(df) < 1e-14:
@@ -91,14 +157,246 @@ def symmetric_newton(
             if abs(fx_new) > abs(fx) * 2:  # Getting worse
                 delta = delta / 2
                 x_new = x - delta
+                fx_new = None
         except Exception:
             # If evaluation fails, reduce step
             delta = delta / 2
             x_new = x - delta
+            fx_new = None
         
+        x_prev, fx_prev = x, fx
         x = x_new
+        fx = fx_new
     
     # Reached max iterations
     return x, max_iter
 
 
+def symmetric_newton_vec(
+    f: Callable[[np.ndarray], np.ndarray],
+    x0: np.ndarray,
+    h0: float = 1e-3,
+    max_iter: int = 50,
+    tol: float = 1e-10,
+    tol_step: float = 1e-12,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Векторная версия symmetric_newton: много независимых уравнений
+    f(x_i) = 0 решаются одновременно.
+
+    f должна быть поэлементной (принимать и возвращать массив той же
+    формы). На каждой итерации f вызывается 3 раза для всех ещё не
+    сошедшихся элементов сразу, вместо 3 вызовов Python на каждый корень.
+
+    Параметры:
+        f: поэлементная функция f(x) -> np.ndarray
+        x0: массив начальных приближений
+        h0, max_iter, tol, tol_step: как в symmetric_newton
+
+    Возвращает:
+        x_root: массив корней (форма x0)
+        n_iter: массив числа итераций для каждого элемента (форма x0)
+
+    Raises:
+        ValueError: если какой-либо элемент расходится (|x| > 1e10)
+
+    Notes:
+        В отличие от скалярной версии нет проверки шага лишним вызовом f
+        (backtracking); ограничение |delta| <= 100 сохраняется.
+    """
+    x0 = np.asarray(x0, dtype=float)
+    x = x0.ravel().copy()
+    h = np.full(x.shape, float(h0))
+    n_iter = np.full(x.shape, max_iter, dtype=int)
+    active = np.arange(x.size)
+    
+    for i in range(max_iter):
+        if active.size == 0:
+            break
+        
+        xa = x[active]
+        fx = np.asarray(f(xa), dtype=float)
+        
+        # Converged by function value
+        keep = np.abs(fx) >= tol
+        n_iter[active[~keep]] = i
+        active, xa, fx = active[keep], xa[keep], fx[keep]
+        if active.size == 0:
+            break
+        
+        # Check for divergence
+        if np.any(np.abs(xa) > 1e10):
+            raise ValueError(f"Method diverged: |x| = {np.max(np.abs(xa))} > 1e10")
+        
+        # Symmetric difference derivative on active lanes only
+        ha = h[active]
+        df = (np.asarray(f(xa + ha), dtype=float) - np.asarray(f(xa - ha), dtype=float)) / (2 * ha)
+        
+        # Near-zero derivative: reduce h, give up once h < 1e-15
+        flat = np.abs(df) < 1e-14
+        h[active[flat]] = ha[flat] / 2
+        give_up = flat & (ha / 2 < 1e-15)
+        n_iter[active[give_up]] = i
+        
+        delta = np.where(flat, 0.0, fx / np.where(flat, 1.0, df))
+        
+        # Converged by step size
+        small = ~flat & (np.abs(delta) < tol_step)
+        n_iter[active[small]] = i
+        
+        # Adaptive step: clip large steps and reduce h
+        big = np.abs(delta) > 100
+        delta = np.clip(delta, -100, 100)
+        h[active[big]] /= 2
+        
+        x[active] = xa - delta
+        # Steps below tol_step are not applied (same as the scalar version)
+        x[active[small]] = xa[small]
+        
+        active = active[~(small | give_up)]
+    
+    return x.reshape(x0.shape), n_iter.reshape(x0.shape)
+
+
+# Тело решателя make_symmetric_newton: параметры подставляются литералами
+# при генерации, чтобы интерпретатор (и numba) видели их как константы.
+_SOLVE_TEMPLATE = """
+def solve(x0):
+    x = x0
+    h = {h0!r}
+    fx = f(x)
+    for i in range({max_iter!r}):
+        if abs(fx) < {tol!r}:
+            return x, i
+        if abs(x) > 1e10:
+            raise ValueError("Method diverged: |x| > 1e10")
+        df = (f(x + h) - f(x - h)) / (2 * h)
+        if abs(df) < 1e-14:
+            h = h / 2
+            if h < 1e-15:
+                return x, i
+            continue
+        delta = fx / df
+        if abs(delta) < {tol_step!r}:
+            return x, i
+        if abs(delta) > 100:
+            delta = 100 * np.sign(delta)
+            h = h / 2
+        x_new = x - delta
+        fx_new = f(x_new)
+        if abs(fx_new) > abs(fx) * 2:
+            delta = delta / 2
+            x_new = x - delta
+            fx_new = f(x_new)
+        x = x_new
+        fx = fx_new
+    return x, {max_iter!r}
+"""
+
+
+def make_symmetric_newton(
+    f: Callable[[float], float],
+    h0: float = 1e-3,
+    max_iter: int = 50,
+    tol: float = 1e-10,
+    tol_step: float = 1e-12,
+    jit: bool = False,
+) -> Callable[[float], Tuple[float, int]]:
+    """
+    Построить решатель x0 -> (x_root, n_iter) для фиксированной f.
+
+    f и параметры фиксируются при создании: тело решателя генерируется
+    из _SOLVE_TEMPLATE с параметрами-литералами, поэтому решатель можно
+    вызывать многократно без повторной передачи и проверки аргументов.
+    Шаг Ньютона тот же, что в symmetric_newton (симметричная производная,
+    ограничение шага, backtracking), но без перехвата исключений из f
+    и без перехода на scipy.optimize.brentq при застое |f(x)|: на таких
+    входах результаты двух решателей могут различаться.
+
+    При jit=True решатель компилируется numba.njit (нужен numba, а f
+    должна быть numba-совместимой, например сама декорирована @njit):
+    f встраивается в скомпилированный цикл, накладные расходы
+    интерпретатора исчезают.
+
+    Raises:
+        ValueError: если h0, tol или tol_step не конечны (nan, inf)
+        ImportError: если jit=True, а numba не установлен
+    """
+    params = {"h0": float(h0), "tol": float(tol), "tol_step": float(tol_step)}
+    for name, value in params.items():
+        # repr(nan) / repr(inf) в сгенерированном коде - неизвестные имена
+        if not math.isfinite(value):
+            raise ValueError(f"{name} must be finite, got {value}")
+    
+    namespace = {"f": f, "np": np}
+    exec(
+        _SOLVE_TEMPLATE.format(max_iter=int(max_iter), **params),
+        namespace,
+    )
+    solve = namespace["solve"]
+    
+    if jit:
+        try:
+            import numba
+        except ImportError as e:
+            raise ImportError("jit=True requires numba to be installed") from e
+        solve = numba.njit(solve)
+    
+    def solver(x0: float) -> Tuple[float, int]:
+        x_root, n_iter = solve(float(x0))
+        return float(x_root), int(n_iter)
+    
+    return solver
+
+
+def aberth(
+    f: Callable[[np.ndarray], np.ndarray],
+    fprime: Callable[[np.ndarray], np.ndarray],
+    z0: np.ndarray,
+    max_iter: int = 50,
+    tol: float = 1e-12,
+) -> Tuple[np.ndarray, int]:
+    """
+    Найти сразу m корней f(z) = 0 методом Аберта-Эрлиха.
+
+    Все приближения обновляются одновременно:
+        z_k <- z_k - 1 / (f'(z_k)/f(z_k) - sum_{r != k} 1/(z_k - z_r))
+    Слагаемое с суммой "отталкивает" приближения друг от друга, поэтому
+    дефляция не нужна, а сходимость к простым корням кубическая.
+
+    Параметры:
+        f: поэлементная функция (принимает complex-массив)
+        fprime: её производная (поэлементно)
+        z0: массив m различных начальных приближений (для комплексных
+            корней - комплексных, например на окружности)
+        max_iter: максимальное число итераций
+        tol: допуск по относительной поправке |dz| <= tol * (1 + |z|)
+
+    Возвращает:
+        z: массив корней (complex, форма z0)
+        n_iter: число выполненных итераций
+    """
+    z = np.array(z0, dtype=complex).ravel()
+    m = z.size
+    
+    for i in range(max_iter):
+        fz = f(z)
+        # Точные корни не двигаем
+        done = fz == 0
+        g = np.zeros(m, dtype=complex)
+        g[~done] = fprime(z[~done]) / fz[~done]
+        
+        diff = z[:, None] - z[None, :]
+        np.fill_diagonal(diff, 1.0)
+        S = 1.0 / diff
+        np.fill_diagonal(S, 0.0)
+        
+        denom = g - S.sum(axis=1)
+        dz = np.zeros(m, dtype=complex)
+        dz[~done] = 1.0 / denom[~done]
+        z -= dz
+        
+        if np.all(np.abs(dz) <= tol * (1.0 + np.abs(z))):
+            return z.reshape(np.shape(z0)), i + 1
+    
+    return z.reshape(np.shape(z0)), max_iter
@@ -1,5 +1,5 @@
 import numpy as np
-from dataclasses import dataclass
+from dataclasses import dataclass, InitVar
 
 
 @dataclass
@@ -10,14 +10,25 @@ class Spectrum1D:
     Attributes:
         omega: Angular frequencies (1D array).
         power: Spectral power/energy density at each frequency (1D array).
+        dtype: Floating dtype for stored arrays (default float64).
+            Pass np.float32 to halve memory traffic in distance/feature
+            kernels over long spectra; scalar reductions (total power,
+            band power, entropy) still accumulate in float64.
+    
+    Spectra derived with normalize() / apply_filter() share the omega
+    array with their source; treat omega as read-only.
     """
     omega: np.ndarray
     power: np.ndarray
+    dtype: InitVar[type | np.dtype | None] = None
     
-    def __post_init__(self):
-        """Validate that omega and power have the same shape."""
-        self.omega = np.asarray(self.omega, dtype=float)
-        self.power = np.asarray(self.power, dtype=float)
+    def __post_init__(self, dtype):
+        """Coerce to contiguous arrays and validate that shapes match."""
+        dtype = np.float64 if dtype is None else dtype
+        # Храним C-contiguous массивы: strided-представления копируются
+        # один раз здесь, а не в каждом векторизованном ядре дальше.
+        self.omega = np.ascontiguousarray(self.omega, dtype=dtype)
+        self.power = np.ascontiguousarray(self.power, dtype=dtype)
         
         if self.omega.shape != self.power.shape:
             raise ValueError(
@@ -32,6 +43,28 @@ class Spectrum1D:
         Returns:
             New Spectrum1D instance with normalized power.
         
+        Raises:
+            ValueError: If total power is zero.
+        """
+        return Spectrum1D(
+            omega=self.omega,
+            power=self.normalize_into(np.empty_like(self.power)),
+            dtype=self.power.dtype,
+        )
+    
+    def normalize_into(self, out: np.ndarray) -> np.ndarray:
+        """
+        Write the normalized power (sum = 1) into a preallocated buffer.
+        
+        Lets hot loops reuse one buffer instead of allocating a new
+        Spectrum1D per call.
+        
+        Args:
+            out: Buffer with the shape of power.
+        
+        Returns:
+            out.
+        
         Raises:
             ValueError: If total power is zero.
         """
@@ -39,19 +72,17 @@ class Spectrum1D:
         if total == 0:
             raise ValueError("Cannot normalize spectrum with zero total power")
         
-        return Spectrum1D(
-            omega=self.omega.copy(),
-            power=self.power / total
-        )
+        return np.divide(self.power, total, out=out)
     
     def total_power(self) -> float:
         """
         Compute total power (integral/sum over all frequencies).
         
         Returns:
-            Total power as a scalar.
+            Total power as a scalar (accumulated in float64 even for
+            float32 spectra).
         """
-        return float(np.sum(self.power))
+        return float(np.sum(self.power, dtype=np.float64))
     
     def apply_filter(self, alpha: np.ndarray) -> "Spectrum1D":
         """
@@ -75,8 +106,9 @@ class Spectrum1D:
             )
         
         return Spectrum1D(
-            omega=self.omega.copy(),
-            power=self.power * alpha
+            omega=self.omega,
+            power=self.power * alpha,
+            dtype=self.power.dtype,
         )
     
     @classmethod
@@ -109,3 +141,110 @@ class Spectrum1D:
         
         return cls(omega=omega, power=power)
 
+
+
+@dataclass
+class SpectrumBatch:
+    """
+    Several spectra on one shared frequency grid (structure of arrays).
+    
+    Per-bin operations (normalize, apply_filter, distances) run over all
+    spectra in a single vectorized call instead of one Python call per
+    Spectrum1D.
+    
+    Attributes:
+        omega: Shared angular frequencies, shape (N,).
+        power: Spectral power, shape (M, N) - one row per spectrum.
+        dtype: Floating dtype for stored arrays (default float64).
+    """
+    omega: np.ndarray
+    power: np.ndarray
+    dtype: InitVar[type | np.dtype | None] = None
+    
+    def __post_init__(self, dtype):
+        """Coerce to contiguous arrays and validate shapes."""
+        dtype = np.float64 if dtype is None else dtype
+        self.omega = np.ascontiguousarray(self.omega, dtype=dtype)
+        self.power = np.ascontiguousarray(self.power, dtype=dtype)
+        
+        if self.omega.ndim != 1 or self.power.ndim != 2:
+            raise ValueError(
+                f"Expected omega of shape (N,) and power of shape (M, N), "
+                f"got {self.omega.shape} and {self.power.shape}"
+            )
+        if self.power.shape[1] != self.omega.shape[0]:
+            raise ValueError(
+                f"Shape mismatch: omega has shape {self.omega.shape}, "
+                f"power has shape {self.power.shape}"
+            )
+    
+    @classmethod
+    def from_spectra(cls, spectra: list[Spectrum1D]) -> "SpectrumBatch":
+        """
+        Stack spectra that share a frequency grid.
+        
+        Raises:
+            ValueError: If the list is empty or the grids differ.
+        """
+        if not spectra:
+            raise ValueError("Cannot build SpectrumBatch from empty list")
+        
+        omega = spectra[0].omega
+        for i, spec in enumerate(spectra):
+            if not np.array_equal(spec.omega, omega):
+                raise ValueError(
+                    f"Spectrum at index {i} has different frequency grid"
+                )
+        
+        power = np.stack([spec.power for spec in spectra])
+        return cls(omega=omega, power=power, dtype=power.dtype)
+    
+    def __len__(self) -> int:
+        return self.power.shape[0]
+    
+    def __getitem__(self, i: int) -> Spectrum1D:
+        """Return spectrum i as a Spectrum1D (views into the batch)."""
+        return Spectrum1D(omega=self.omega, power=self.power[i], dtype=self.power.dtype)
+    
+    def total_power(self) -> np.ndarray:
+        """Total power of every spectrum, shape (M,)."""
+        return self.power.sum(axis=1)
+    
+    def normalize(self) -> "SpectrumBatch":
+        """
+        Return a new batch where every row sums to 1.
+        
+        Raises:
+            ValueError: If any spectrum has zero total power.
+        """
+        total = self.total_power()
+        if np.any(total == 0):
+            raise ValueError("Cannot normalize spectrum with zero total power")
+        
+        return SpectrumBatch(
+            omega=self.omega,
+            power=self.power / total[:, None],
+            dtype=self.power.dtype,
+        )
+    
+    def apply_filter(self, alpha: np.ndarray) -> "SpectrumBatch":
+        """
+        Apply a filter alpha(omega) of shape (N,) (same for all spectra)
+        or (M, N) (one per spectrum).
+        
+        Raises:
+            ValueError: If alpha has incompatible shape.
+        """
+        alpha = np.asarray(alpha, dtype=float)
+        
+        if alpha.shape not in (self.omega.shape, self.power.shape):
+            raise ValueError(
+                f"Shape mismatch: alpha has shape {alpha.shape}, "
+                f"expected {self.omega.shape} or {self.power.shape}"
+            )
+        
+        return SpectrumBatch(
+            omega=self.omega,
+            power=self.power * alpha,
+            dtype=self.power.dtype,
+        )
@@ -1,4 +1,8 @@
+import os
+import warnings
 import numpy as np
+import scipy.fft
+from functools import lru_cache
 from .spectrum import Spectrum1D
 
 
@@ -6,6 +10,7 @@ def timeseries_to_spectrum(
     signal: np.ndarray,
     dt: float,
     window: str = "hann",
+    dtype: type | np.dtype = np.float64,
 ) -> Spectrum1D:
     """
     Преобразовать одномерный временной сигнал в амплитудный спектр.
@@ -14,6 +19,8 @@ def timeseries_to_spectrum(
         signal: 1D-массив отсчётов во времени.
         dt: шаг по времени (секунды).
         window: тип окна ("hann" или None).
+        dtype: точность расчёта и результата. np.float32 (по желанию)
+               вдвое снижает трафик памяти; FFT тогда идёт в complex64.
     
     Возвращает:
         Spectrum1D с:
@@ -25,46 +32,166 @@ def timeseries_to_spectrum(
         >>> signal = np.sin(2 * np.pi * 50 * t)  # 50 Hz
         >>> spectrum = timeseries_to_spectrum(signal, dt=0.001)
     """
-    signal = np.asarray(signal, dtype=float)
+    signal = np.asarray(signal, dtype=dtype)
     
     if signal.ndim != 1:
         raise ValueError(f"Signal must be 1D array, got shape {signal.shape}")
     
-    n = len(signal)
+    omega, power = _power_spectra(signal[None, :], dt, window)
+    return Spectrum1D(omega=omega, power=power[0], dtype=power.dtype)
+
+
+def timeseries_batch_to_spectrum(
+    signals: np.ndarray,
+    dt: float,
+    window: str = "hann",
+    dtype: type | np.dtype = np.float64,
+) -> list[Spectrum1D]:
+    """
+    Спектры для нескольких каналов с общим шагом dt за один вызов FFT.
+    
+    Параметры:
+        signals: 2D-массив (n_channels, n_samples).
+        dt: шаг по времени (секунды).
+        window: тип окна ("hann" или None).
+        dtype: точность расчёта (см. timeseries_to_spectrum).
+    
+    Возвращает:
+        Список Spectrum1D (по одному на строку signals), та же нормировка,
+        что в timeseries_to_spectrum. Все каналы обрабатываются одним
+        rfft(axis=-1) вместо цикла Python по каналам.
+    """
+    signals = np.asarray(signals, dtype=dtype)
+    
+    if signals.ndim != 2:
+        raise ValueError(f"Signals must be 2D array, got shape {signals.shape}")
+    
+    omega, power = _power_spectra(signals, dt, window)
+    return [Spectrum1D(omega=omega, power=row, dtype=power.dtype) for row in power]
+
+
+@lru_cache(maxsize=8)
+def _hann_window(n: int, dtype: np.dtype = np.dtype(np.float64)) -> np.ndarray:
+    """
+    Окно Ханна длины n. Кэшируется: анализ блоков одинаковой длины
+    не пересчитывает окно на каждом вызове. Массив только для чтения.
+    """
+    w = np.hanning(n).astype(dtype)
+    w.setflags(write=False)
+    return w
+
+
+@lru_cache(maxsize=8)
+def _omega_grid(n: int, dt: float) -> np.ndarray:
+    """
+    Угловые частоты rfft для n отсчётов с шагом dt: 2*pi*rfftfreq(n, dt).
+    Кэшируется; спектры одной длины делят один массив (только для чтения).
+    """
+    omega = 2 * np.pi * scipy.fft.rfftfreq(n, d=dt)
+    omega.setflags(write=False)
+    return omega
+
+
+def _fft_workers_from_env() -> int:
+    """
+    Число потоков scipy.fft из SPECTRAL_FFT_WORKERS (по умолчанию -1:
+    все ядра). Нечисловое значение или 0 не роняют импорт модуля:
+    выдаётся предупреждение и используется -1.
+    """
+    raw = os.environ.get("SPECTRAL_FFT_WORKERS")
+    if raw is None:
+        return -1
+    try:
+        workers = int(raw)
+    except ValueError:
+        workers = 0
+    if workers == 0:
+        warnings.warn(
+            f"Ignoring invalid SPECTRAL_FFT_WORKERS={raw!r}: expected a "
+            "non-zero integer, using -1 (all cores)",
+            RuntimeWarning,
+            stacklevel=2,
+        )
+        return -1
+    return workers
+
+
+# Число потоков scipy.fft. При параллельном запуске в нескольких процессах
+# (pytest -n, пул задач) задайте SPECTRAL_FFT_WORKERS=1, чтобы потоки
+# не конкурировали за ядра.
+_FFT_WORKERS = _fft_workers_from_env()
+
+
+# Окна по имени: фабрика (n, dtype) -> массив окна или None (без окна).
+# Новое окно (Hamming, Blackman, ...) добавляется сюда, ядро не меняется.
+_WINDOWS = {
+    "hann": _hann_window,
+    None: lambda n, dtype: None,
+}
+
+
+@lru_cache(maxsize=8)
+def _power_scale(n: int, dtype: np.dtype = np.dtype(np.float64)) -> np.ndarray:
+    """
+    Веса бинов rfft длины n: 2/n, кроме DC (1/n) и, для чётного n,
+    Nyquist (1/n) - коэффициент 2 учитывает отрицательные частоты.
+    """
+    scale = np.full(n // 2 + 1, 2.0 / n, dtype=dtype)
+    scale[0] = 1.0 / n
+    if n % 2 == 0:
+        scale[-1] = 1.0 / n
+    scale.setflags(write=False)
+    return scale
+
+
+def _power_spectra(
+    signals: np.ndarray,
+    dt: float,
+    window: str | None,
+    work: np.ndarray | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Общее ядро: (n_channels, n) -> (omega, power (n_channels, n // 2 + 1)).
+
+    work: необязательный буфер формы и dtype signals под центрированный
+          сигнал (переиспользуется вызывающим между кадрами; содержимое
+          после вызова не определено - FFT пишет в него на месте).
+    """
+    n = signals.shape[-1]
     if n == 0:
         raise ValueError("Signal must not be empty")
     
-    # Удаление DC-компонента (вычитание среднего)
-    signal_ac = signal - np.mean(signal)
+    try:
+        window_fn = _WINDOWS[window]
+    except (KeyError, TypeError):
+        raise ValueError(f"Unknown window type: {window}. Use 'hann' or None.") from None
     
-    # Применение оконной функции
-    if window == "hann":
-        window_func = np.hanning(n)
-        signal_windowed = signal_ac * window_func
-    elif window is None:
-        signal_windowed = signal_ac
-    else:
-        raise ValueError(f"Unknown window type: {window}. Use 'hann' or None.")
+    # Удаление DC-компонента (вычитание среднего)
+    signal_windowed = np.subtract(
+        signals, np.mean(signals, axis=-1, keepdims=True), out=work
+    )
     
-    # FFT (только положительные частоты)
-    fft_vals = np.fft.rfft(signal_windowed)
+    # Применение оконной функции на месте (1D окно транслируется по каналам)
+    w = window_fn(n, signals.dtype)
+    if w is not None:
+        np.multiply(signal_windowed, w, out=signal_windowed)
     
-    # Частоты в Герцах
-    freq_hz = np.fft.rfftfreq(n, d=dt)
+    # FFT (только положительные частоты). scipy.fft (pocketfft с SIMD)
+    # распределяет пакет каналов по потокам (см. _FFT_WORKERS).
+    fft_vals = scipy.fft.rfft(
+        signal_windowed, axis=-1, overwrite_x=True, workers=_FFT_WORKERS
+    )
     
-    # Преобразование в угловые частоты (rad/s)
-    omega = 2 * np.pi * freq_hz
+    # Угловые частоты (rad/s): общая кэшированная сетка для данных (n, dt)
+    omega = _omega_grid(n, float(dt))
     
-    # Мощность: |FFT|^2, нормированная на количество точек
-    # Коэффициент 2 для учёта энергии в отрицательных частотах (кроме DC и Nyquist)
-    power = np.abs(fft_vals) ** 2 / n
+    # Мощность: |FFT|^2 = re^2 + im^2 за один проход по complex-буферу
+    # (как пары float), без sqrt внутри np.abs и без временных массивов
+    re_im = fft_vals.view(fft_vals.real.dtype).reshape(fft_vals.shape + (2,))
+    power = np.einsum("...i,...i->...", re_im, re_im)
     
-    # Удвоить мощность для всех частот кроме DC (индекс 0) и Nyquist (последний для чётного n)
-    if n % 2 == 0:
-        # Чётное n: DC и Nyquist не удваиваются
-        power[1:-1] *= 2
-    else:
-        # Нечётное n: только DC не удваивается
-        power[1:] *= 2
+    # Нормировка на n и удвоение (кроме DC и Nyquist) - одно умножение
+    # на заранее посчитанный вектор весов
+    power *= _power_scale(n, power.dtype)
     
-    return Spectrum1D(omega=omega, power=power)
+    return omega, power
@@ -1,7 +1,7 @@
 import numpy as np
 import pytest
 from spectral_physics.diagnostics import ChannelConfig, SpectralAnalyzer, HealthMonitor
-from spectral_physics.spectrum import Spectrum1D
+from spectral_physics.spectrum import Spectrum1D, SpectrumBatch
 
 
 def test_channel_config_creation():
@@ -78,6 +78,44 @@ def test_spectral_analyzer_freq_filter():
     assert np.all(freq_hz <= 150.0)
 
 
+def test_spectral_analyzer_reuse_across_lengths():
+    """Test that a reused analyzer filters frames of different lengths."""
+    dt = 0.001
+    config = ChannelConfig(name="stream", dt=dt, freq_min=50.0, freq_max=150.0)
+    analyzer = SpectralAnalyzer(config)
+    
+    for n in (1000, 1000, 777):
+        signal = np.sin(2 * np.pi * 100 * np.arange(n) * dt)
+        spectrum = analyzer.analyze(signal)
+        freq_hz = spectrum.omega / (2 * np.pi)
+        
+        assert np.all(freq_hz >= 50.0)
+        assert np.all(freq_hz <= 150.0)
+        assert abs(freq_hz[np.argmax(spectrum.power)] - 100.0) < 2.0
+
+
+def test_spectral_analyzer_lengths_sharing_bin_count():
+    """Test that frames of length 2k and 2k + 1 do not share band bounds."""
+    from spectral_physics.diagnostics import _BAND_CACHE_SIZE
+    
+    dt = 0.001
+    config = ChannelConfig(name="stream", dt=dt, freq_min=50.0, freq_max=150.0)
+    analyzer = SpectralAnalyzer(config)
+    
+    rng = np.random.default_rng(0)
+    analyzer.analyze(rng.normal(size=1000))
+    spectrum = analyzer.analyze(rng.normal(size=1001))
+    fresh = SpectralAnalyzer(config).analyze(rng.normal(size=1001))
+    
+    assert np.array_equal(spectrum.omega, fresh.omega)
+    assert spectrum.omega[0] / (2 * np.pi) >= 50.0
+    
+    # Variable-length streams do not grow the cache without bound
+    for n in range(200, 200 + 2 * _BAND_CACHE_SIZE):
+        analyzer.analyze(rng.normal(size=n))
+    assert len(analyzer._band_cache) <= _BAND_CACHE_SIZE
+
+
 def test_health_monitor_score():
     """Test HealthMonitor.score calculation."""
     omega = np.array([1.0, 2.0, 3.0])
@@ -268,3 +306,69 @@ def test_extract_features():
 
 
 
+
+
+def test_health_monitor_batch():
+    """Test HealthMonitor on a SpectrumBatch against per-spectrum calls."""
+    omega = np.array([1.0, 2.0, 3.0])
+    ref_spec = Spectrum1D(omega=omega, power=np.array([1.0, 2.0, 1.0]))
+    spectra = [
+        Spectrum1D(omega=omega, power=np.array([1.0, 2.0, 1.0])),
+        Spectrum1D(omega=omega, power=np.array([5.0, 0.5, 3.0])),
+    ]
+    
+    monitor = HealthMonitor(reference=ref_spec, threshold=0.1)
+    batch = SpectrumBatch.from_spectra(spectra)
+    
+    scores = monitor.score(batch)
+    assert np.allclose(scores, [monitor.score(s) for s in spectra])
+    assert monitor.is_anomalous(batch).tolist() == [False, True]
+
+
+def test_health_monitor_is_anomalous_matches_score_long():
+    """Test chunked early-exit is_anomalous against score on a long spectrum."""
+    rng = np.random.default_rng(0)
+    omega = np.linspace(0.0, 10.0, 20000)
+    monitor = HealthMonitor(
+        reference=Spectrum1D(omega=omega, power=rng.random(omega.size)),
+        threshold=0.0,
+    )
+    current = Spectrum1D(omega=omega, power=rng.random(omega.size))
+    score = monitor.score(current)
+    
+    monitor.threshold = 0.5 * score
+    assert monitor.is_anomalous(current)
+    monitor.threshold = 2.0 * score
+    assert not monitor.is_anomalous(current)
+
+
+def test_health_monitor_reference_replaced_on_new_grid():
+    """Test that the monitor's buffer follows a reference on a different grid."""
+    omega3 = np.array([1.0, 2.0, 3.0])
+    monitor = HealthMonitor(
+        reference=Spectrum1D(omega=omega3, power=np.array([1.0, 2.0, 1.0])),
+        threshold=0.1,
+    )
+    assert monitor.score(Spectrum1D(omega=omega3, power=np.array([1.0, 2.0, 1.0]))) < 1e-12
+    
+    omega5 = np.linspace(1.0, 5.0, 5)
+    ref5 = Spectrum1D(omega=omega5, power=np.array([1.0, 2.0, 3.0, 2.0, 1.0]))
+    anom5 = Spectrum1D(omega=omega5, power=np.array([5.0, 0.5, 3.0, 0.5, 5.0]))
+    monitor.signature.reference = ref5
+    
+    assert monitor.score(ref5) < 1e-12
+    assert abs(monitor.score(anom5) - monitor.signature.distance_l2(anom5)) < 1e-12
+    assert not monitor.is_anomalous(ref5)
+    assert monitor.is_anomalous(anom5)
+
+
+def test_health_monitor_zero_power_raises_with_negative_threshold():
+    """Test that a negative threshold does not hide the zero-power error."""
+    omega = np.array([1.0, 2.0, 3.0])
+    monitor = HealthMonitor(
+        reference=Spectrum1D(omega=omega, power=np.array([1.0, 2.0, 1.0])),
+        threshold=-1.0,
+    )
+    
+    with pytest.raises(ValueError, match="zero total power"):
+        monitor.is_anomalous(Spectrum1D(omega=omega, power=np.zeros(3)))
@@ -1,7 +1,9 @@
 import numpy as np
 import pytest
 from spectral_physics.spectrum import Spectrum1D
-from spectral_physics.diagnostics import extract_features, spectral_band_power, spectral_entropy
+from spectral_physics.diagnostics import (
+    extract_features, extract_features_batch, spectral_band_power, spectral_entropy
+)
 
 def test_extract_features_structure():
     # Create a dummy spectrum
@@ -57,3 +59,16 @@ def test_spectral_entropy():
     spec2 = Spectrum1D(omega, power2)
     # H = - (1*ln(1) + 0) = 0
     assert spectral_entropy(spec2) == 0.0
+
+def test_extract_features_batch_matches_single():
+    rng = np.random.default_rng(0)
+    omega = np.linspace(0, 100, 101)
+    spectra = [Spectrum1D(omega, rng.random(101)) for _ in range(4)]
+    spectra.append(Spectrum1D(omega, np.zeros(101)))
+    bands = [(0, 2), (1, 10), (5, 3)]
+    
+    features = extract_features_batch(spectra, bands)
+    
+    assert features.shape == (5, 4)
+    for row, spec in zip(features, spectra):
+        assert np.allclose(row, extract_features(spec, bands), rtol=1e-12, atol=0)
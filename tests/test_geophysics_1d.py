@@ -15,10 +15,10 @@ def test_layered_medium_creation():
     assert chain.n == 20
     
     # First 10 nodes (0..9) should have mass ~ 1.0 * 1.0 = 1.0
-    assert np.allclose(chain.m[:10], 1.0)
+    assert np.all(chain.m[:10] == 1.0)
     
     # Next 10 nodes (10..19) should have mass ~ 2.0 * 1.0 = 2.0
-    assert np.allclose(chain.m[10:], 2.0)
+    assert np.all(chain.m[10:] == 2.0)
 
 def test_simulation_runs():
     l1 = Layer(thickness=5.0, density=1.0, stiffness=1.0)
@@ -57,3 +57,16 @@ def test_inversion_sanity():
     # 4.0 is 4 nodes.
     # The optimizer should find 5.0 (or close to it if continuous interpretation)
     assert abs(h_found - true_h) < 1.5 # Tolerance due to dx discretization
+
+def test_oscillator_chain_cached_until_layers_change():
+    l1 = Layer(thickness=10.0, density=1.0, stiffness=1.0)
+    medium = LayeredMedium1D(layers=[l1], dx=1.0)
+    
+    chain = medium.to_oscillator_chain()
+    assert medium.to_oscillator_chain() is chain
+    
+    # In-place edit of a layer invalidates the cached chain
+    l1.density = 3.0
+    rebuilt = medium.to_oscillator_chain()
+    assert rebuilt is not chain
+    assert np.all(rebuilt.m == 3.0)
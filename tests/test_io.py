@@ -76,6 +76,37 @@ def test_load_timeseries_csv_invalid_column():
         Path(temp_path).unlink()
 
 
+def test_load_timeseries_csv_ragged_rows():
+    """Test that rows with a different number of fields raise ValueError."""
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+        f.write("1,2,3\n4,5\n")
+        temp_path = f.name
+    
+    try:
+        with pytest.raises(ValueError, match="data row 2 has 2 columns, expected 3"):
+            load_timeseries_csv(temp_path, column=0, skip_header=False)
+    finally:
+        Path(temp_path).unlink()
+
+
+def test_load_timeseries_csv_validates_selected_column_only():
+    """Test that only the selected column has to be numeric."""
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+        f.write("1,x,\n2,y,\n")
+        temp_path = f.name
+    
+    try:
+        signal = load_timeseries_csv(temp_path, column=0, skip_header=False)
+        np.testing.assert_array_equal(signal, [1.0, 2.0])
+        
+        with pytest.raises(ValueError, match="Failed to load CSV file"):
+            load_timeseries_csv(temp_path, column=1, skip_header=False)
+        with pytest.raises(ValueError, match="Failed to load CSV file"):
+            load_timeseries_csv(temp_path, column=2, skip_header=False)
+    finally:
+        Path(temp_path).unlink()
+
+
 def test_save_load_spectrum_npz():
     """Test save and load spectrum roundtrip."""
     omega = np.array([1.0, 2.0, 3.0])
@@ -35,3 +35,21 @@ def test_grid_ldos_map_shape():
     
     assert ldos_map.shape == (5, 5)
     assert np.all(ldos_map >= 0)
+
+def test_grid_ldos_map_cache_invalidated_by_defect():
+    grid = OscillatorGrid2D(nx=5, ny=5, kx=1.0, ky=1.0, m=1.0)
+    window = (0.0, 10.0)
+    
+    ldos_clean = grid.ldos_map(n_modes=10, freq_window=window)
+    assert np.array_equal(grid.ldos_map(n_modes=10, freq_window=window), ldos_clean)
+    
+    # A new mass map must not reuse the cached defect-free modes
+    mass_map = np.ones((5, 5))
+    mass_map[2, 2] = 5.0
+    grid.mass_map = mass_map
+    ldos_defect = grid.ldos_map(n_modes=10, freq_window=window)
+    assert not np.allclose(ldos_defect, ldos_clean)
+    
+    # Nor may an in-place edit of that map
+    mass_map[2, 2] = 1.0
+    assert np.allclose(grid.ldos_map(n_modes=10, freq_window=window), ldos_clean)
@@ -239,3 +239,141 @@ def test_health_profile_score_features():
 
 
 
+
+
+def test_health_profile_is_anomalous_after_score():
+    """is_anomalous after score must agree with per-channel distances."""
+    from spectral_physics.material import HealthProfile
+
+    omega = np.array([1.0, 2.0, 3.0])
+    spec_ref = Spectrum1D(omega=omega, power=np.array([1.0, 2.0, 1.0]))
+    spec_anom = Spectrum1D(omega=omega, power=np.array([5.0, 0.5, 3.0]))
+
+    sig = MaterialSignature(reference=spec_ref)
+    profile = HealthProfile(signatures={"ch1": sig, "ch2": sig})
+
+    current = {"ch1": spec_ref, "ch2": spec_anom}
+    scores = profile.score(current)
+
+    assert abs(scores["ch2"] - sig.distance_l2(spec_anom)) < 1e-12
+
+    results = profile.is_anomalous(current, {"ch1": 0.1, "ch2": 0.1}, scores=scores)
+    assert results == {"ch1": False, "ch2": True}
+    assert profile.is_anomalous(current, {"ch1": 0.1, "ch2": 0.1}) == results
+
+    # Mismatched grid still raises through the batched path
+    bad = Spectrum1D(omega=np.array([1.0, 2.0, 4.0]), power=np.ones(3))
+    with pytest.raises(ValueError, match="Frequency grids do not match"):
+        profile.score({"ch1": bad})
+
+
+def test_is_anomalous_long_spectrum_matches_distance():
+    """Chunked early-exit check agrees with distance_l2 on long spectra."""
+    rng = np.random.default_rng(0)
+    omega = np.linspace(0.0, 1.0, 10_000)
+    spec1 = Spectrum1D(omega=omega, power=rng.random(10_000))
+    spec2 = Spectrum1D(omega=omega, power=rng.random(10_000))
+    
+    sig = MaterialSignature(reference=spec1)
+    distance = sig.distance_l2(spec2)
+    
+    assert sig.is_anomalous(spec2, threshold=0.5 * distance) is True
+    assert sig.is_anomalous(spec2, threshold=2.0 * distance) is False
+
+
+def test_health_profile_rebuilds_cache_when_signature_replaced():
+    """Replacing a signature under an existing name must not reuse stale references."""
+    from spectral_physics.material import HealthProfile
+
+    omega = np.array([1.0, 2.0, 3.0])
+    spec_a = Spectrum1D(omega=omega, power=np.array([1.0, 2.0, 1.0]))
+    spec_b = Spectrum1D(omega=omega, power=np.array([5.0, 0.5, 3.0]))
+
+    profile = HealthProfile(signatures={"c": MaterialSignature(reference=spec_a)})
+    assert profile.score({"c": spec_b})["c"] > 0.1
+
+    profile.signatures["c"] = MaterialSignature(reference=spec_b)
+    assert profile.score({"c": spec_b})["c"] < 1e-12
+    assert profile.is_anomalous({"c": spec_b}, {"c": 0.1}) == {"c": False}
+
+
+def test_health_profile_is_anomalous_sees_in_place_edits_after_score():
+    """Without explicit scores, is_anomalous recomputes distances from current spectra."""
+    from spectral_physics.material import HealthProfile
+
+    omega = np.array([1.0, 2.0, 3.0])
+    spec_ref = Spectrum1D(omega=omega, power=np.array([1.0, 2.0, 1.0]))
+    spec = Spectrum1D(omega=omega, power=np.array([1.0, 2.0, 1.0]))
+
+    profile = HealthProfile(signatures={"c": MaterialSignature(reference=spec_ref)})
+    profile.score({"c": spec})
+
+    spec.power[:] = [5.0, 0.5, 3.0]
+    assert profile.is_anomalous({"c": spec}, {"c": 0.1}) == {"c": True}
+
+
+def test_signature_reference_reassignment_refreshes_cache():
+    """Assigning a new reference must invalidate the cached normalized reference."""
+    from spectral_physics.material import HealthProfile
+
+    omega = np.array([1.0, 2.0, 3.0])
+    spec_a = Spectrum1D(omega=omega, power=np.array([1.0, 2.0, 1.0]))
+    spec_b = Spectrum1D(omega=omega, power=np.array([5.0, 0.5, 3.0]))
+
+    sig = MaterialSignature(reference=spec_a)
+    profile = HealthProfile(signatures={"c": sig})
+    assert sig.distance_l2(spec_b) > 0.1
+    assert profile.score({"c": spec_b})["c"] > 0.1
+
+    sig.reference = spec_b
+    assert sig.distance_l2(spec_b) < 1e-12
+    assert abs(sig.distance_cosine(spec_b)) < 1e-12
+    assert sig.is_anomalous(spec_b, threshold=0.1) is False
+    assert profile.score({"c": spec_b})["c"] < 1e-12
+
+
+def test_signature_reference_in_place_edit_refreshes_cache():
+    """Editing reference.power in place (or rebinding it) must not leave stale caches."""
+    omega = np.array([1.0, 2.0, 3.0])
+    spec_a = Spectrum1D(omega=omega, power=np.array([1.0, 2.0, 1.0]))
+    spec_b = Spectrum1D(omega=omega, power=np.array([5.0, 0.5, 3.0]))
+
+    sig = MaterialSignature(reference=spec_a)
+    assert sig.distance_l2(spec_b) > 0.1
+
+    spec_a.power[:] = spec_b.power
+    assert sig.distance_l2(spec_b) < 1e-12
+    assert sig.is_anomalous(spec_b, threshold=0.1) is False
+
+    spec_a.power = np.array([1.0, 2.0, 1.0])
+    assert sig.distance_l2(spec_b) > 0.1
+
+
+def test_distance_cosine_after_in_place_reference_edit():
+    """Cosine distance uses a reference norm consistent with the edited power."""
+    omega = np.array([1.0, 2.0])
+    spec_a = Spectrum1D(omega=omega, power=np.array([1.0, 0.0]))
+    spec_b = Spectrum1D(omega=omega, power=np.array([3.0, 4.0]))
+
+    sig = MaterialSignature(reference=spec_a)
+    assert abs(sig.distance_cosine(spec_b) - 0.4) < 1e-12
+
+    spec_a.power *= 10.0
+    assert abs(sig.distance_cosine(spec_b) - 0.4) < 1e-12
+
+    spec_a.power[:] = spec_b.power
+    assert abs(sig.distance_cosine(spec_b)) < 1e-12
+
+
+def test_is_anomalous_zero_power_raises_even_with_negative_threshold():
+    """The negative-threshold shortcut must not hide the zero-power error."""
+    omega = np.array([1.0, 2.0, 3.0])
+    sig = MaterialSignature(reference=Spectrum1D(omega=omega, power=np.array([1.0, 2.0, 1.0])))
+    zero = Spectrum1D(omega=omega, power=np.zeros(3))
+
+    with pytest.raises(ValueError, match="zero total power"):
+        sig.is_anomalous(zero, threshold=-1.0)
+
+    zero_sig = MaterialSignature(reference=zero)
+    with pytest.raises(ValueError, match="zero total power"):
+        zero_sig.is_anomalous(sig.reference, threshold=-1.0)
@@ -71,3 +71,22 @@ def test_health_profile_score_features(monkeypatch):
     # Diff: band power 22 vs 11 -> diff 11. Entropy same.
     # Distance = sqrt(11^2 + 0) = 11.
     assert np.isclose(scores2['ch1'], 11.0)
+
+
+def test_health_profile_score_features_multichannel():
+    omega = np.linspace(0, 10, 11)
+    spec = Spectrum1D(omega, np.ones_like(omega))
+    bands = {'ch1': [(0.0, 2.0)], 'ch2': [(0.0, 2.0)]}
+    
+    feat_ref = np.array([11.0, np.log(11)])
+    profile = HealthProfile(
+        signatures={},
+        feature_signatures={
+            'ch1': FeatureSignature(reference_features=feat_ref),
+            'ch2': FeatureSignature(reference_features=feat_ref + [1.0, 0.0]),
+        }
+    )
+    
+    scores = profile.score_features({'ch1': spec, 'ch2': spec}, bands)
+    assert np.isclose(scores['ch1'], 0.0)
+    assert np.isclose(scores['ch2'], 1.0)
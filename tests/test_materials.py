@@ -15,8 +15,8 @@ def test_material_patch_spectrum():
     spec = patch.surface_spectrum()
     
     assert len(spec.omega) == 2
-    assert np.allclose(spec.omega, [1.0, 2.0])
-    assert np.allclose(spec.power, [0.5, 0.5])
+    assert np.array_equal(spec.omega, [1.0, 2.0])
+    assert np.array_equal(spec.power, [0.5, 0.5])
 
 def test_effective_coupling():
     # Atom A: line at 1.0, power 1.0
@@ -126,3 +126,15 @@ def test_different_parameters():
     
     # Heavier chain should have lower frequencies
     assert np.all(omega3 < omega1)
+
+
+def test_eigenmodes_subset():
+    """Test that n_modes returns the lowest modes of the full solve."""
+    chain = OscillatorChain1D(n=30, k=np.linspace(1.0, 2.0, 29), m=np.linspace(1.0, 3.0, 30))
+    omega_full, modes_full = chain.eigenmodes()
+    omega, modes = chain.eigenmodes(n_modes=5)
+    
+    assert omega.shape == (5,)
+    assert modes.shape == (30, 5)
+    np.testing.assert_allclose(omega, omega_full[:5], rtol=1e-10)
+    np.testing.assert_allclose(np.abs(modes), np.abs(modes_full[:, :5]), atol=1e-8)
@@ -1,5 +1,7 @@
 import numpy as np
 import pytest
+import scipy.linalg
+import scipy.sparse
 from spectral_physics.medium_2d import OscillatorGrid2D
 
 def test_grid_2x2_stiffness():
@@ -14,7 +16,9 @@ def test_grid_2x2_stiffness():
     # ...
     
     grid = OscillatorGrid2D(nx=2, ny=2, kx=1.0, ky=2.0, m=1.0)
-    K = grid.stiffness_matrix()
+    K_sparse = grid.stiffness_matrix()
+    assert scipy.sparse.issparse(K_sparse)
+    K = K_sparse.toarray()
     
     assert K.shape == (4, 4)
     
@@ -59,3 +63,96 @@ def test_eigenmodes_subset():
     
     # Check sorted
     assert np.all(np.diff(omega) >= 0)
+
+def test_stiffness_operator_matches_matrix():
+    rng = np.random.default_rng(0)
+    grid = OscillatorGrid2D(
+        nx=4, ny=3, kx=1.0, ky=2.0, m=1.0,
+        kx_map=rng.uniform(0.5, 1.5, (3, 4)),
+    )
+    v = rng.normal(size=12)
+    
+    K = grid.stiffness_matrix()
+    op = grid.stiffness_operator()
+    
+    assert np.allclose(op.matvec(v), K @ v)
+
+def test_eigenmodes_matrix_free():
+    mass_map = np.ones((6, 6))
+    mass_map[2, 3] = 3.0
+    grid = OscillatorGrid2D(nx=6, ny=6, kx=1.0, ky=1.5, m=1.0, mass_map=mass_map)
+    
+    omega_ref, _ = grid.eigenmodes()
+    omega, modes = grid.eigenmodes(n_modes=4, matrix_free=True)
+    
+    assert modes.shape == (36, 4)
+    assert np.allclose(omega, omega_ref[:4], atol=1e-6)
+
+def test_eigenmodes_uniform_kronecker():
+    grid = OscillatorGrid2D(nx=5, ny=4, kx=1.3, ky=0.7, m=2.0)
+    
+    omega, modes = grid.eigenmodes(n_modes=6)
+    
+    K = grid.stiffness_matrix().toarray()
+    lam_ref = scipy.linalg.eigh(K, b=2.0 * np.eye(20), eigvals_only=True)
+    assert np.allclose(omega, np.sqrt(lam_ref[:6]))
+    assert np.allclose(K @ modes, 2.0 * modes * omega**2)
+
+def test_eigenmodes_unknown_backend():
+    grid = OscillatorGrid2D(nx=3, ny=3, kx=1.0, ky=1.0, m=1.0)
+    
+    with pytest.raises(ValueError, match="backend"):
+        grid.eigenmodes(n_modes=2, backend="tpu")
+
+def test_eigenmodes_gpu_backend():
+    mass_map = np.ones((5, 5))
+    mass_map[1, 2] = 2.0
+    grid = OscillatorGrid2D(nx=5, ny=5, kx=1.0, ky=1.0, m=1.0, mass_map=mass_map)
+    
+    try:
+        import cupy  # noqa: F401
+    except ImportError:
+        with pytest.raises(ImportError, match="cupy"):
+            grid.eigenmodes(n_modes=3, backend="gpu")
+        return
+    
+    omega_ref, _ = grid.eigenmodes()
+    omega, modes = grid.eigenmodes(n_modes=3, backend="gpu")
+    assert modes.shape == (25, 3)
+    assert np.allclose(omega, omega_ref[:3], atol=1e-6)
+
+def test_grid_float32_dtype():
+    mass_map = np.ones((6, 6))
+    mass_map[2, 2] = 2.0
+    grid32 = OscillatorGrid2D(nx=6, ny=6, kx=1.0, ky=1.0, m=1.0, mass_map=mass_map, dtype=np.float32)
+    grid64 = OscillatorGrid2D(nx=6, ny=6, kx=1.0, ky=1.0, m=1.0, mass_map=mass_map)
+    
+    assert grid32.stiffness_matrix().dtype == np.float32
+    
+    ldos32 = grid32.ldos_map(n_modes=5, freq_window=(0.0, 2.0))
+    ldos64 = grid64.ldos_map(n_modes=5, freq_window=(0.0, 2.0))
+    assert ldos32.dtype == np.float32
+    assert np.allclose(ldos32, ldos64, atol=1e-4)
+
+def test_grid_dtype_accepts_dtype_instance_and_string():
+    """dtype may be given as a scalar type, an np.dtype instance or a string."""
+    grid = OscillatorGrid2D(nx=5, ny=4, kx=1.0, ky=2.0, m=1.5, dtype=np.float32)
+    omega_ref, modes_ref = grid.eigenmodes(n_modes=3)
+    
+    for dtype in (np.dtype("float32"), "float32"):
+        grid = OscillatorGrid2D(nx=5, ny=4, kx=1.0, ky=2.0, m=1.5, dtype=dtype)
+        assert grid.dtype == np.float32
+        omega, modes = grid.eigenmodes(n_modes=3)
+        assert omega.dtype == np.float32 and modes.dtype == np.float32
+        assert np.array_equal(omega, omega_ref)
+        assert np.array_equal(modes, modes_ref)
+
+def test_eigenmodes_cached_copies():
+    """Repeated eigenmodes calls reuse the solve but hand out copies."""
+    grid = OscillatorGrid2D(nx=4, ny=3, kx=1.0, ky=1.0, m=1.0)
+    omega, modes = grid.eigenmodes(n_modes=5)
+    modes[:] = 0.0
+    
+    omega2, modes2 = grid.eigenmodes(n_modes=5)
+    assert np.array_equal(omega, omega2)
+    assert np.any(modes2 != 0.0)
@@ -41,3 +41,42 @@ def test_score_ndt_state_with_defect():
     # Mask
     mask = ndt_defect_mask(scores, threshold=0.1)
     assert mask[5, 5]
+
+def test_build_ndt_profile_parallel_matches_serial():
+    grid = OscillatorGrid2D(nx=6, ny=6, kx=1.0, ky=1.0, m=1.0)
+    
+    np.random.seed(123)
+    serial = build_ndt_profile(grid, n_modes=6, freq_window=(0.0, 2.0), n_samples=3, noise_level=0.1)
+    np.random.seed(123)
+    parallel = build_ndt_profile(grid, n_modes=6, freq_window=(0.0, 2.0), n_samples=3, noise_level=0.1, n_jobs=2)
+    
+    assert np.allclose(serial.ldos_mean, parallel.ldos_mean)
+    assert np.allclose(serial.ldos_std, parallel.ldos_std)
+
+def test_build_ndt_profile_dense_batch_matches_per_sample():
+    from spectral_physics.ndt import _perturbed_ldos, _welford
+    
+    grid = OscillatorGrid2D(nx=5, ny=4, kx=1.0, ky=1.5, m=1.0)
+    np.random.seed(7)
+    profile = build_ndt_profile(grid, n_modes=15, freq_window=(0.0, 2.0), n_samples=4, noise_level=0.1)
+    
+    # Same noise, solved sample by sample with the sparse/dense dispatcher
+    np.random.seed(7)
+    noise = np.random.normal(0, 0.1, size=(4, 4, 5))
+    mass_maps = np.maximum(1.0 + noise, 1e-3)
+    K = grid.stiffness_matrix()
+    mean, std = _welford(_perturbed_ldos(mm, K, 15, (0.0, 2.0)) for mm in mass_maps)
+    
+    assert np.allclose(profile.ldos_mean, mean)
+    assert np.allclose(profile.ldos_std, std)
+
+def test_build_ndt_profile_rejects_zero_samples():
+    from spectral_physics.ndt import _welford
+    
+    grid = OscillatorGrid2D(nx=4, ny=4, kx=1.0, ky=1.0, m=1.0)
+    for noise_level in (0.0, 0.1):
+        with pytest.raises(ValueError, match="n_samples must be >= 1"):
+            build_ndt_profile(grid, n_modes=5, freq_window=(0.0, 2.0), n_samples=0, noise_level=noise_level)
+    
+    with pytest.raises(ValueError, match="zero samples"):
+        _welford(iter(()))
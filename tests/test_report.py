@@ -1,7 +1,8 @@
 import tempfile
 import pytest
 from pathlib import Path
-from spectral_physics.report import generate_markdown_report
+import numpy as np
+from spectral_physics.report import generate_markdown_report, generate_ndt_report
 
 def test_generate_markdown_report_basic():
     """Test basic report generation."""
@@ -44,3 +45,27 @@ def test_generate_markdown_report_all_ok():
         
     finally:
         Path(temp_path).unlink()
+
+def test_generate_ndt_report_top_defects():
+    """Test that defect locations are listed by decreasing score."""
+    scores = np.zeros((4, 5))
+    scores[1, 2] = 5.0
+    scores[3, 0] = 7.0
+    mask = scores > 1.0
+    
+    with tempfile.NamedTemporaryFile(suffix='.md', delete=False) as f:
+        temp_path = f.name
+        
+    try:
+        generate_ndt_report(scores, scores, scores, mask, temp_path)
+        
+        with open(temp_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+            
+        first = content.index("| 0 | 3 | 7.0000 |")
+        second = content.index("| 2 | 1 | 5.0000 |")
+        assert first < second
+        assert "2 defect pixels detected" in content
+        
+    finally:
+        Path(temp_path).unlink()
@@ -1,6 +1,11 @@
 import numpy as np
 import pytest
-from spectral_physics.root_finding import symmetric_newton
+from spectral_physics.root_finding import (
+    aberth,
+    make_symmetric_newton,
+    symmetric_newton,
+    symmetric_newton_vec,
+)
 
 
 def test_simple_quadratic():
@@ -131,3 +136,129 @@ def test_tol_step_stops_on_flat_region():
     # Result should still be close to zero
     assert abs(x_root) < 0.1
 
+
+
+def test_bracket_uses_brent():
+    """Test that bracket=(a, b) finds the root inside the interval."""
+    def f(x):
+        return x**3 - x - 1
+    
+    x_root, n_iter = symmetric_newton(f, x0=0.0, bracket=(1.0, 2.0))
+    
+    assert abs(f(x_root)) < 1e-8
+    assert isinstance(x_root, float)
+    assert isinstance(n_iter, int)
+
+
+def test_function_value_reused():
+    """Test that f(x) is not re-evaluated at the accepted iterate."""
+    calls = []
+    
+    def f(x):
+        calls.append(x)
+        return x**2 - 2
+    
+    x_root, n_iter = symmetric_newton(f, x0=1.0)
+    
+    assert abs(x_root - np.sqrt(2)) < 1e-8
+    assert len(calls) <= 3 * n_iter + 1
+
+
+def test_symmetric_newton_vec_matches_scalar():
+    """Test that the vectorized solver agrees with the scalar one."""
+    x0 = np.linspace(2.5, 3.8, 20)
+    
+    x_vec, n_vec = symmetric_newton_vec(np.sin, x0)
+    x_ref = [symmetric_newton(np.sin, x)[0] for x in x0]
+    
+    assert x_vec.shape == x0.shape
+    assert n_vec.shape == x0.shape
+    assert np.allclose(x_vec, x_ref)
+    assert np.allclose(x_vec, np.pi)
+
+
+def test_symmetric_newton_vec_max_iterations():
+    """Test that lanes without a root stop at max_iter."""
+    def f(x):
+        return x**2 + 1
+    
+    x_root, n_iter = symmetric_newton_vec(f, np.array([1.0, 2.0]), max_iter=10)
+    
+    assert np.all(n_iter == 10)
+
+
+def test_make_symmetric_newton_matches_function():
+    """Test that a prebuilt solver gives the same result as symmetric_newton."""
+    def f(x):
+        return x**3 - x - 1
+    
+    solver = make_symmetric_newton(f)
+    
+    for x0 in (1.5, 2.0, 0.5):
+        assert solver(x0) == symmetric_newton(f, x0=x0)
+
+
+@pytest.mark.parametrize("param", ["h0", "tol", "tol_step"])
+@pytest.mark.parametrize("value", [float("nan"), float("inf"), -float("inf")])
+def test_make_symmetric_newton_rejects_non_finite(param, value):
+    """Test that non-finite parameters are rejected when the solver is built."""
+    with pytest.raises(ValueError, match=f"{param} must be finite"):
+        make_symmetric_newton(np.sin, **{param: value})
+
+
+def test_make_symmetric_newton_jit():
+    """Test the numba path (or the error when numba is missing)."""
+    try:
+        import numba
+    except ImportError:
+        with pytest.raises(ImportError, match="numba"):
+            make_symmetric_newton(np.sin, jit=True)
+        return
+    
+    solver = make_symmetric_newton(numba.njit(lambda x: np.sin(x)), jit=True)
+    x_root, n_iter = solver(3.0)
+    assert abs(x_root - np.pi) < 1e-6
+
+
+def test_secant_uses_fewer_evaluations():
+    """Test that secant=True converges with fewer calls to f."""
+    def counted(calls):
+        def f(x):
+            calls.append(x)
+            return np.exp(x) - 2
+        return f
+    
+    calls_newton, calls_secant = [], []
+    x_newton, _ = symmetric_newton(counted(calls_newton), x0=0.0)
+    x_secant, _ = symmetric_newton(counted(calls_secant), x0=0.0, secant=True)
+    
+    assert abs(x_newton - np.log(2)) < 1e-8
+    assert abs(x_secant - np.log(2)) < 1e-8
+    assert len(calls_secant) < len(calls_newton)
+
+
+def test_stalled_newton_falls_back_to_brent():
+    """Test that an oscillating Newton iteration is rescued by brentq."""
+    # Newton on arctan overshoots and diverges from |x0| > ~1.39
+    x_root, n_iter = symmetric_newton(np.arctan, x0=1.5)
+    
+    assert abs(x_root) < 1e-8
+    assert n_iter <= 50
+
+
+def test_aberth_polynomial_roots():
+    """Test simultaneous roots of (x-1)(x-2)(x-3)."""
+    coeffs = [1.0, -6.0, 11.0, -6.0]
+    
+    def f(z):
+        return np.polyval(coeffs, z)
+    
+    def fprime(z):
+        return np.polyval(np.polyder(coeffs), z)
+    
+    z0 = 3.0 * np.exp(1j * (2 * np.pi * np.arange(3) / 3 + 0.4))
+    roots, n_iter = aberth(f, fprime, z0)
+    
+    assert np.allclose(np.sort(roots.real), [1.0, 2.0, 3.0])
+    assert np.allclose(roots.imag, 0.0, atol=1e-10)
+    assert n_iter < 50
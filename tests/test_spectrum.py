@@ -1,6 +1,6 @@
 import numpy as np
 import pytest
-from spectral_physics.spectrum import Spectrum1D
+from spectral_physics.spectrum import Spectrum1D, SpectrumBatch
 
 
 def test_spectrum_creation():
@@ -69,6 +69,17 @@ def test_normalize_zero_power():
         spec.normalize()
 
 
+def test_normalize_into_buffer():
+    """Test normalization into a caller-provided buffer."""
+    spec = Spectrum1D(omega=np.array([1.0, 2.0, 3.0]), power=np.array([1.0, 2.0, 3.0]))
+    out = np.empty(3)
+    
+    result = spec.normalize_into(out)
+    
+    assert result is out
+    np.testing.assert_array_equal(out, spec.normalize().power)
+
+
 def test_apply_filter():
     """Test applying frequency-dependent filter."""
     omega = np.array([1.0, 2.0, 3.0])
@@ -151,3 +162,57 @@ def test_from_function_shape_mismatch():
         Spectrum1D.from_function(omega, bad_func)
 
 
+
+
+def test_spectrum_float32_dtype():
+    """Test opt-in float32 storage is preserved by derived spectra."""
+    omega = np.array([1.0, 2.0, 3.0])
+    power = np.array([1.0, 2.0, 3.0])
+    
+    spec = Spectrum1D(omega=omega, power=power, dtype=np.float32)
+    
+    assert spec.omega.dtype == np.float32
+    assert spec.power.dtype == np.float32
+    assert spec.normalize().power.dtype == np.float32
+    assert spec.apply_filter(np.ones(3)).power.dtype == np.float32
+    
+    # Default stays float64
+    assert Spectrum1D(omega=omega, power=power).power.dtype == np.float64
+
+
+def test_spectrum_float32_total_power_accumulates_in_float64():
+    """Test that float32 spectra sum their power in float64."""
+    n = 1_000_003
+    power = np.full(n, 0.1)
+    spec = Spectrum1D(omega=np.arange(n), power=power, dtype=np.float32)
+    
+    expected = np.float32(0.1).item() * n
+    assert abs(spec.total_power() - expected) < 1e-12 * expected
+
+
+def test_spectrum_batch_normalize_matches_single():
+    """Test that SpectrumBatch.normalize agrees with Spectrum1D.normalize."""
+    omega = np.linspace(0, 10, 5)
+    spectra = [
+        Spectrum1D(omega=omega, power=np.arange(1.0, 6.0)),
+        Spectrum1D(omega=omega, power=np.ones(5)),
+    ]
+    
+    batch = SpectrumBatch.from_spectra(spectra)
+    normalized = batch.normalize()
+    
+    assert len(batch) == 2
+    assert np.allclose(normalized.total_power(), 1.0)
+    for i, spec in enumerate(spectra):
+        assert np.allclose(normalized[i].power, spec.normalize().power)
+
+
+def test_spectrum_batch_grid_mismatch():
+    """Test that from_spectra rejects different frequency grids."""
+    spectra = [
+        Spectrum1D(omega=np.array([1.0, 2.0]), power=np.ones(2)),
+        Spectrum1D(omega=np.array([1.0, 3.0]), power=np.ones(2)),
+    ]
+    
+    with pytest.raises(ValueError, match="different frequency grid"):
+        SpectrumBatch.from_spectra(spectra)
@@ -1,16 +1,21 @@
 import numpy as np
 import pytest
-from spectral_physics.timeseries import timeseries_to_spectrum
+from spectral_physics.timeseries import timeseries_to_spectrum, timeseries_batch_to_spectrum
 
 
-def test_single_sine_wave():
+@pytest.fixture(scope="module")
+def t_1s_1ms():
+    """Time grid of 1 s sampled at 1 ms, shared by the sine-wave tests."""
+    return np.arange(0, 1.0, 0.001)
+
+
+def test_single_sine_wave(t_1s_1ms):
     """Test that single sine wave produces peak at correct frequency."""
     # Generate 50 Hz sine wave
     freq = 50.0  # Hz
-    duration = 1.0  # seconds
     dt = 0.001  # 1 ms sampling
     
-    t = np.arange(0, duration, dt)
+    t = t_1s_1ms
     signal = np.sin(2 * np.pi * freq * t)
     
     spectrum = timeseries_to_spectrum(signal, dt=dt)
@@ -24,14 +29,13 @@ def test_single_sine_wave():
     assert abs(peak_freq_hz - freq) < 2.0  # Within 2 Hz
 
 
-def test_two_sine_waves():
+def test_two_sine_waves(t_1s_1ms):
     """Test that sum of two sines produces two peaks."""
     freq1 = 50.0  # Hz
     freq2 = 120.0  # Hz
-    duration = 1.0
     dt = 0.001
     
-    t = np.arange(0, duration, dt)
+    t = t_1s_1ms
     signal = np.sin(2 * np.pi * freq1 * t) + 0.5 * np.sin(2 * np.pi * freq2 * t)
     
     spectrum = timeseries_to_spectrum(signal, dt=dt)
@@ -40,7 +44,7 @@ def test_two_sine_waves():
     freq_hz = spectrum.omega / (2 * np.pi)
     
     # Find two largest peaks
-    peak_indices = np.argsort(spectrum.power)[-2:]
+    peak_indices = np.argpartition(spectrum.power, -2)[-2:]
     peak_freqs = sorted(freq_hz[peak_indices])
     
     # Should have peaks near 50 and 120 Hz
@@ -48,12 +52,11 @@ def test_two_sine_waves():
     assert abs(peak_freqs[1] - freq2) < 5.0
 
 
-def test_constant_signal():
+def test_constant_signal(t_1s_1ms):
     """Test that constant signal has maximum only near zero frequency."""
-    duration = 1.0
     dt = 0.001
     
-    t = np.arange(0, duration, dt)
+    t = t_1s_1ms
     signal = np.ones_like(t) * 5.0  # Constant
     
     spectrum = timeseries_to_spectrum(signal, dt=dt)
@@ -65,13 +68,12 @@ def test_constant_signal():
     assert peak_omega < 10.0  # Very low frequency
 
 
-def test_window_none():
+def test_window_none(t_1s_1ms):
     """Test that window=None works."""
     freq = 50.0
-    duration = 1.0
     dt = 0.001
     
-    t = np.arange(0, duration, dt)
+    t = t_1s_1ms
     signal = np.sin(2 * np.pi * freq * t)
     
     spectrum = timeseries_to_spectrum(signal, dt=dt, window=None)
@@ -81,13 +83,12 @@ def test_window_none():
     assert len(spectrum.power) > 0
 
 
-def test_window_hann():
+def test_window_hann(t_1s_1ms):
     """Test that window='hann' works."""
     freq = 50.0
-    duration = 1.0
     dt = 0.001
     
-    t = np.arange(0, duration, dt)
+    t = t_1s_1ms
     signal = np.sin(2 * np.pi * freq * t)
     
     spectrum = timeseries_to_spectrum(signal, dt=dt, window="hann")
@@ -124,12 +125,11 @@ def test_multidimensional_signal():
         timeseries_to_spectrum(signal, dt=dt)
 
 
-def test_dc_removal():
+def test_dc_removal(t_1s_1ms):
     """Test that DC component is removed."""
-    duration = 1.0
     dt = 0.001
     
-    t = np.arange(0, duration, dt)
+    t = t_1s_1ms
     signal = 10.0 + np.sin(2 * np.pi * 50 * t)  # DC offset + sine
     
     spectrum = timeseries_to_spectrum(signal, dt=dt)
@@ -148,3 +148,67 @@ def test_positive_frequencies_only():
     
     # All frequencies should be >= 0
     assert np.all(spectrum.omega >= 0)
+
+
+def test_batch_matches_single_channel():
+    """Test that batched spectra equal per-channel spectra."""
+    rng = np.random.default_rng(0)
+    signals = rng.normal(size=(3, 101))
+    dt = 0.01
+    
+    spectra = timeseries_batch_to_spectrum(signals, dt=dt)
+    
+    assert len(spectra) == 3
+    for row, spec in zip(signals, spectra):
+        ref = timeseries_to_spectrum(row, dt=dt)
+        assert np.array_equal(spec.omega, ref.omega)
+        assert np.allclose(spec.power, ref.power)
+
+
+def test_batch_requires_2d():
+    """Test that a 1D array is rejected by the batch API."""
+    with pytest.raises(ValueError, match="must be 2D array"):
+        timeseries_batch_to_spectrum(np.ones(10), dt=0.1)
+
+
+def test_float32_matches_float64():
+    """Test that opt-in float32 spectra agree with float64 ones."""
+    signal = np.random.default_rng(0).normal(size=1000)
+    
+    spec64 = timeseries_to_spectrum(signal, dt=0.001)
+    spec32 = timeseries_to_spectrum(signal, dt=0.001, dtype=np.float32)
+    
+    assert spec32.power.dtype == np.float32
+    assert np.allclose(spec32.power, spec64.power, rtol=1e-4, atol=1e-6 * spec64.power.max())
+
+
+def test_omega_grid_shared_between_calls():
+    """Test that spectra of equal length and dt share one read-only omega grid."""
+    rng = np.random.default_rng(1)
+    
+    spec_a = timeseries_to_spectrum(rng.normal(size=256), dt=0.01)
+    spec_b = timeseries_to_spectrum(rng.normal(size=256), dt=0.01)
+    
+    assert spec_a.omega is spec_b.omega
+    assert not spec_a.omega.flags.writeable
+    assert np.array_equal(spec_a.omega, 2 * np.pi * np.fft.rfftfreq(256, d=0.01))
+
+
+@pytest.mark.parametrize("raw", ["abc", "0", ""])
+def test_fft_workers_env_invalid_falls_back(monkeypatch, raw):
+    """Test that a malformed or zero SPECTRAL_FFT_WORKERS warns and uses all cores."""
+    from spectral_physics.timeseries import _fft_workers_from_env
+    
+    monkeypatch.setenv("SPECTRAL_FFT_WORKERS", raw)
+    with pytest.warns(RuntimeWarning, match="SPECTRAL_FFT_WORKERS"):
+        assert _fft_workers_from_env() == -1
+
+
+def test_fft_workers_env_valid(monkeypatch):
+    """Test that a valid SPECTRAL_FFT_WORKERS is used as is."""
+    from spectral_physics.timeseries import _fft_workers_from_env
+    
+    monkeypatch.setenv("SPECTRAL_FFT_WORKERS", "2")
+    assert _fft_workers_from_env() == 2
+    monkeypatch.delenv("SPECTRAL_FFT_WORKERS")
+    assert _fft_workers_from_env() == -1